@@ -23,7 +23,7 @@ fileConfig(config.config_file_name)
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 from app.db.session import Base
-from app.models import user, note
+from app.models import user, note, refresh_token, note_import
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
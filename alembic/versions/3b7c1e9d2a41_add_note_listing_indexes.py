@@ -0,0 +1,53 @@
+"""add_note_listing_indexes
+
+Revision ID: 3b7c1e9d2a41
+Revises: 20510c1c4e3d
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7c1e9d2a41'
+down_revision = '20510c1c4e3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notes_owner_id_created_at_id',
+            'notes',
+            ['owner_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_notes_created_at_id',
+            'notes',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_notes_created_at_id',
+            table_name='notes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_notes_owner_id_created_at_id',
+            table_name='notes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
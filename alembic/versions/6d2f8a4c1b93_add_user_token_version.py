@@ -0,0 +1,27 @@
+"""add_user_token_version
+
+Revision ID: 6d2f8a4c1b93
+Revises: 3b7c1e9d2a41
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d2f8a4c1b93'
+down_revision = '3b7c1e9d2a41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False)
+    )
+
+
+def downgrade():
+    op.drop_column('users', 'token_version')
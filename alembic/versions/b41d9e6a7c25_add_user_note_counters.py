@@ -0,0 +1,39 @@
+"""add_user_note_counters
+
+Revision ID: b41d9e6a7c25
+Revises: 8a5e0c7f3d12
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b41d9e6a7c25'
+down_revision = '8a5e0c7f3d12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('note_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('note_bytes', sa.BigInteger(), server_default='0', nullable=False))
+    
+    # Backfill from the existing notes; octet_length counts the UTF-8 bytes,
+    # where a cast to bytea would parse backslashes as escapes
+    op.execute(
+        """
+        UPDATE users SET
+            note_count = (SELECT count(*) FROM notes WHERE notes.owner_id = users.id),
+            note_bytes = (
+                SELECT coalesce(sum(octet_length(notes.description)), 0)
+                FROM notes WHERE notes.owner_id = users.id
+            )
+        """
+    )
+
+
+def downgrade():
+    op.drop_column('users', 'note_bytes')
+    op.drop_column('users', 'note_count')
@@ -0,0 +1,45 @@
+"""add_note_search_vector
+
+Revision ID: c7e2a9f1d480
+Revises: b41d9e6a7c25
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a9f1d480'
+down_revision = 'b41d9e6a7c25'
+branch_labels = None
+depends_on = None
+
+
+# Must match NOTES_SEARCH_VECTOR_SQL in app/models/note.py, or the planner
+# won't use the index for search queries
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade():
+    # Expression index rather than a stored column: adding a generated column
+    # rewrites the whole table under an exclusive lock, while a concurrent
+    # index build lets reads and writes continue
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notes_search_vector "
+            f"ON notes USING gin (({SEARCH_VECTOR_SQL}))"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_notes_search_vector',
+            table_name='notes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,38 @@
+"""add_note_imports
+
+Revision ID: d5a3f8b2c614
+Revises: c7e2a9f1d480
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a3f8b2c614'
+down_revision = 'c7e2a9f1d480'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('note_imports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('committed_lines', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('error_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('owner_id', 'key', name='uq_note_imports_owner_id_key')
+    )
+    op.create_index(op.f('ix_note_imports_id'), 'note_imports', ['id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_note_imports_id'), table_name='note_imports')
+    op.drop_table('note_imports')
@@ -0,0 +1,39 @@
+"""add_note_owner_updated_at_index
+
+Revision ID: e8b4c2d7f913
+Revises: d5a3f8b2c614
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b4c2d7f913'
+down_revision = 'd5a3f8b2c614'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notes_owner_id_updated_at',
+            'notes',
+            ['owner_id', 'updated_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_notes_owner_id_updated_at',
+            table_name='notes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
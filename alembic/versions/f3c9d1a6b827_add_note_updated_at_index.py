@@ -0,0 +1,39 @@
+"""add_note_updated_at_index
+
+Revision ID: f3c9d1a6b827
+Revises: e8b4c2d7f913
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c9d1a6b827'
+down_revision = 'e8b4c2d7f913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notes_updated_at',
+            'notes',
+            ['updated_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_notes_updated_at',
+            table_name='notes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
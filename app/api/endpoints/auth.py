@@ -1,20 +1,54 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.deps import get_current_active_user
-from app.db.session import get_db
+from app.core.deps import Principal, get_current_active_user, remember_principal, revoke_tokens
+from app.db.session import get_async_db, get_async_read_db
+from app.models.refresh_token import RefreshToken
 from app.models.user import User, UserRole
-from app.schemas.user import UserCreate, UserResponse, Token
-from app.utils.auth import create_access_token, get_password_hash, verify_password
+from app.schemas.user import UserCreate, UserResponse, Token, RefreshTokenRequest
+from app.utils.auth import (
+    create_access_token, create_refresh_token, get_password_hash_async, hash_refresh_token,
+    verify_password_async
+)
+from app.utils.etag import cache_headers, is_not_modified, make_etag, not_modified_response
 
 router = APIRouter(prefix=f"{settings.API_V1_STR}/auth")
 
 
+async def _issue_tokens(db: AsyncSession, user: User) -> dict:
+    """
+    Create an access token and a stored refresh token for `user`, then commit
+    """
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        subject=user.id,
+        role=user.role,
+        expires_delta=access_token_expires,
+        token_version=user.token_version,
+    )
+    
+    refresh_token, token_hash = create_refresh_token()
+    db.add(RefreshToken(
+        token_hash=token_hash,
+        user_id=user.id,
+        token_version=user.token_version,
+        expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+    await db.commit()
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token
+    }
+
+
 @router.post(
     "/register", 
     response_model=UserResponse, 
@@ -24,12 +58,13 @@ router = APIRouter(prefix=f"{settings.API_V1_STR}/auth")
     responses={
         201: {"description": "User registered successfully"},
         400: {"description": "Email already registered"},
-        422: {"description": "Validation error in input data"}
+        422: {"description": "Validation error in input data"},
+        503: {"description": "Too many concurrent password operations, retry later"}
     }
 )
-def register(
+async def register(
     user_in: UserCreate = Body(..., description="User registration data"), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Register a new user account.
@@ -46,7 +81,8 @@ def register(
     - Only admin users can later promote other users to admin role
     """
     # Check if the email is already registered
-    user = db.query(User).filter(User.email == user_in.email).first()
+    result = await db.execute(select(User).where(User.email == user_in.email))
+    user = result.scalar_one_or_none()
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -57,16 +93,19 @@ def register(
     # Only admins can promote users to admin role via the admin endpoints
     user_role = UserRole.USER
     
+    # Hash in the bounded worker pool - bcrypt is CPU bound
+    hashed_password = await get_password_hash_async(user_in.password)
+    
     # Create new user
     db_user = User(
         email=user_in.email,
         name=user_in.name,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         role=user_role
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
@@ -78,11 +117,12 @@ def register(
     responses={
         200: {"description": "Login successful, access token returned"},
         401: {"description": "Invalid credentials"},
-        422: {"description": "Validation error in input data"}
+        422: {"description": "Validation error in input data"},
+        503: {"description": "Too many concurrent password operations, retry later"}
     }
 )
-def login(
-    db: Session = Depends(get_db),
+async def login(
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
@@ -92,30 +132,141 @@ def login(
     - **password**: User's password
     
     Returns:
-    - Access token and token type
+    - Access token, token type and refresh token
     
     Notes:
     - The access token includes user role information
     - Use the returned token in Authorization header as "Bearer {token}"
+    - Use the refresh token with `/auth/refresh` to renew the access token without the password
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalar_one_or_none()
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        subject=user.id, role=user.role, expires_delta=access_token_expires
+    return await _issue_tokens(db, user)
+
+
+@router.post(
+    "/refresh",
+    response_model=Token,
+    summary="Refresh Access Token",
+    description="Exchange a refresh token for a new access token and a rotated refresh token.",
+    responses={
+        200: {"description": "New tokens issued"},
+        401: {"description": "Invalid, expired or revoked refresh token"},
+        422: {"description": "Validation error in input data"}
+    }
+)
+async def refresh_access_token(
+    token_in: RefreshTokenRequest = Body(..., description="Refresh token to exchange"),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Renew an access token without re-entering the password.
+    
+    - **refresh_token**: Refresh token from login or a previous refresh
+    
+    Returns:
+    - New access token and a new refresh token
+    
+    Notes:
+    - Each refresh token can be used once; the old one is revoked on rotation
+    - Presenting an already rotated token revokes all of the user's tokens
+    - Logout, deactivation and role changes also invalidate refresh tokens
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"}
     )
     
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
+    result = await db.execute(
+        select(RefreshToken, User)
+        .join(User, RefreshToken.user_id == User.id)
+        .where(RefreshToken.token_hash == hash_refresh_token(token_in.refresh_token))
+    )
+    row = result.first()
+    if row is None:
+        raise credentials_exception
+    stored_token, user = row
+    
+    async def reject_replay():
+        # A rotated token was replayed - treat it as leaked and revoke everything
+        revoke_tokens(user)
+        await db.commit()
+        await db.refresh(user)
+        remember_principal(user)
+        raise credentials_exception
+    
+    if stored_token.rotated_at is not None:
+        await reject_replay()
+    
+    if (
+        stored_token.revoked_at is not None
+        or stored_token.expires_at <= datetime.utcnow()
+        or stored_token.token_version < user.token_version
+        or not user.is_active
+    ):
+        raise credentials_exception
+    
+    # Rotate: the presented token is spent. The claim is conditional, so of
+    # two concurrent refreshes only one wins; the other is a replay
+    now = datetime.utcnow()
+    claimed = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.id == stored_token.id,
+            RefreshToken.rotated_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(rotated_at=now, revoked_at=now)
+        .returning(RefreshToken.id)
+    )
+    if claimed.first() is None:
+        await reject_replay()
+    return await _issue_tokens(db, user)
+
+
+@router.post(
+    "/revoke",
+    summary="Revoke Refresh Token",
+    description="Revoke a single refresh token, e.g. to sign out one device.",
+    responses={
+        200: {"description": "Refresh token revoked"},
+        422: {"description": "Validation error in input data"}
     }
+)
+async def revoke_refresh_token(
+    token_in: RefreshTokenRequest = Body(..., description="Refresh token to revoke"),
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Revoke a refresh token.
+    
+    - **refresh_token**: Refresh token to revoke
+    
+    Returns:
+    - Success message
+    
+    Notes:
+    - Unknown or already revoked tokens are accepted silently
+    """
+    result = await db.execute(
+        select(RefreshToken).where(
+            RefreshToken.token_hash == hash_refresh_token(token_in.refresh_token)
+        )
+    )
+    stored_token = result.scalar_one_or_none()
+    if stored_token is not None and stored_token.revoked_at is None:
+        stored_token.revoked_at = datetime.utcnow()
+        await db.commit()
+    
+    return {"message": "Refresh token revoked"}
 
 
 @router.get(
@@ -125,11 +276,15 @@ def login(
     description="Get information about the currently authenticated user.",
     responses={
         200: {"description": "User profile retrieved successfully"},
+        304: {"description": "Not modified since the ETag the client holds"},
         401: {"description": "Not authenticated"}
     }
 )
-def get_current_user_info(
-    current_user: User = Depends(get_current_active_user)
+async def get_current_user_info(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Get information about the currently authenticated user.
@@ -140,5 +295,55 @@ def get_current_user_info(
     Notes:
     - Requires authentication
     - Returns the user associated with the provided access token
+    - Responses carry an ETag; a matching If-None-Match gets an empty 304
     """
-    return current_user
\ No newline at end of file
+    # Principals carry auth state only; the profile and note counters come
+    # from the users row
+    user = await db.get(User, current_user.id)
+    if user is None:
+        # Stateless tokens can outlive a deleted user
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Counter upkeep leaves updated_at alone, so the counters are part of the
+    # ETag and no Last-Modified is sent
+    etag = make_etag("me", user.id, user.updated_at, user.note_count, user.note_bytes)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    response.headers.update(cache_headers(etag))
+    return user
+
+
+@router.post(
+    "/logout",
+    summary="Logout",
+    description="Revoke every access token issued to the current user.",
+    responses={
+        200: {"description": "Tokens revoked"},
+        401: {"description": "Not authenticated"}
+    }
+)
+async def logout(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """
+    Log out everywhere by revoking all of the current user's access tokens.
+    
+    Returns:
+    - Success message
+    
+    Notes:
+    - Access and refresh tokens issued before this call are rejected from the next request on
+    - Log in again to obtain a new token
+    """
+    user = await db.get(User, current_user.id)
+    revoke_tokens(user)
+    await db.commit()
+    await db.refresh(user)
+    
+    remember_principal(user)
+    return {"message": "Logged out successfully"}
\ No newline at end of file
@@ -1,21 +1,360 @@
-from typing import Any, List
+from typing import Any, List, Optional, Tuple, Union
 import math
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query, Path, Body
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql import ColumnElement, Select
 
 from app.core.config import settings
-from app.core.deps import get_current_active_user, get_admin_user
-from app.db.session import get_db
+from app.core.deps import Principal, get_current_active_user, get_admin_user
+from app.db.query_stats import allow_repeated_queries
+from app.db.session import get_async_db, get_async_read_db, get_async_read_sessionmaker
 from app.models.user import User, UserRole
 from app.models.note import Note
-from app.schemas.note import NoteCreate, NoteUpdate, NoteResponse
-from app.schemas.user import PaginatedResponse, PaginationMeta
+from app.models.note_import import NoteImport
+from app.schemas.note import (
+    NoteCreate, NoteUpdate, NoteResponse, NoteBulkCreate, NoteBulkError, NoteBulkCreateResponse,
+    NoteBulkSelector, NoteBulkUpdate, NoteBulkResult, ExportFormat,
+    NoteImportLineError, NoteImportProgress, NoteImportResult, NoteSparseResponse
+)
+from app.schemas.user import PaginatedResponse, PaginationMeta, TotalStrategy
+from app.utils.compression import compress, negotiate_encoding
+from app.utils.etag import (
+    cache_headers,
+    check_if_match,
+    encoded_etag,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
+from app.utils.export import EXPORT_MEDIA_TYPES, stream_notes_export
+from app.utils.ndjson import LineTooLong, iter_ndjson_lines
+from app.utils.note_stats import (
+    adjust_note_counters,
+    adjust_note_counters_many,
+    description_bytes,
+    description_bytes_expr,
+)
+from app.utils.pagination import count_total, decode_cursor, encode_cursor
+from app.utils.response_cache import note_list_cache
+from app.utils.search import build_note_search
+from app.utils.serialization import (
+    NOTE_COLUMNS, NOTE_FIELDS, RawJSONResponse, note_adapter, note_columns, note_page_adapter,
+    note_page_adapter_for, note_row, note_rows, parse_note_fields
+)
 
 router = APIRouter(prefix=f"{settings.API_V1_STR}/notes")
 
 
+def _bulk_criteria(selector: NoteBulkSelector) -> List[ColumnElement]:
+    """
+    Translate a bulk selector into WHERE criteria, without the permission rule
+    """
+    criteria = []
+    if selector.ids is not None:
+        criteria.append(Note.id.in_(selector.ids))
+    if selector.created_before is not None:
+        criteria.append(Note.created_at < selector.created_before)
+    return criteria
+
+
+async def _bulk_result(
+    db: AsyncSession,
+    selector: NoteBulkSelector,
+    criteria: List[ColumnElement],
+    affected_ids: List[int],
+    current_user: Principal,
+) -> dict:
+    """
+    Report the affected ids and sort the other requested ids into forbidden and missing
+    """
+    result = {"affected": sorted(affected_ids), "forbidden": [], "missing": []}
+    if selector.ids is None:
+        return result
+    
+    unaffected = set(selector.ids) - set(affected_ids)
+    forbidden = set()
+    if unaffected and current_user.role != UserRole.ADMIN:
+        # Notes that match everything but the owner rule belong to someone else
+        forbidden = set((await db.scalars(
+            select(Note.id).where(*criteria, Note.id.in_(unaffected))
+        )).all())
+    result["forbidden"] = sorted(forbidden)
+    result["missing"] = sorted(unaffected - forbidden)
+    return result
+
+
+def _locked_bytes_by_owner(scope: List[ColumnElement], dialect_name: str) -> Select:
+    """
+    Sum the description sizes of the notes in `scope` per owner, locking the
+    rows so a following UPDATE sees the same set.
+
+    The lock is taken in a subquery: Postgres rejects FOR UPDATE together
+    with GROUP BY.
+    """
+    locked = (
+        select(Note.owner_id, description_bytes_expr(dialect_name).label("size"))
+        .where(*scope)
+        .with_for_update()
+        .subquery()
+    )
+    return select(locked.c.owner_id, func.sum(locked.c.size)).group_by(locked.c.owner_id)
+
+
+def _note_etag(note: Note) -> str:
+    """
+    Strong ETag for a single note; every write bumps updated_at
+    """
+    return make_etag("note", note.id, note.updated_at)
+
+
+async def _list_validators(
+    db: AsyncSession,
+    request: Request,
+    owner_id: Optional[int] = None,
+) -> str:
+    """
+    ETag for a note listing.
+
+    The fingerprint is (note count, max updated_at) plus the query string: any
+    create, update or delete changes one of the two. Both are cheap lookups:
+    the count is the users.note_count counter (summed over users for the
+    admin scope) and the max is answered by ix_notes_owner_id_updated_at, or
+    ix_notes_updated_at across all owners. No Last-Modified is derived from
+    the max, since deleting the newest note would move it backwards.
+    """
+    if owner_id is not None:
+        count = select(User.note_count).where(User.id == owner_id).scalar_subquery()
+        last_updated = select(func.max(Note.updated_at)).where(Note.owner_id == owner_id).scalar_subquery()
+    else:
+        count = select(func.sum(User.note_count)).scalar_subquery()
+        last_updated = select(func.max(Note.updated_at)).scalar_subquery()
+    count, last_updated = (await db.execute(select(count, last_updated))).one()
+    
+    return make_etag("notes", owner_id, request.url.query, count or 0, last_updated)
+
+
+async def _list_response(
+    db: AsyncSession,
+    request: Request,
+    criteria: List[ColumnElement],
+    page: int,
+    size: int,
+    cursor: Optional[str],
+    total_strategy: Optional[TotalStrategy] = None,
+    owner_id: Optional[int] = None,
+    fields: Optional[str] = None,
+) -> RawJSONResponse:
+    """
+    Serve a note listing: 304 if the client is current, else the cached or
+    freshly paginated page, precompressed when the client accepts it.
+
+    The list ETag is the cache key, so a cached page is only reused while the
+    listing's fingerprint is unchanged, even if another process missed the
+    invalidation.
+    """
+    try:
+        selected = parse_note_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    
+    etag = await _list_validators(db, request, owner_id)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    headers = cache_headers(etag)
+    
+    # Compressed pages are cached next to the plain ones, so a hit is not
+    # compressed again; CompressionMiddleware passes them through
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding is not None:
+        encoded_headers = {
+            **headers,
+            "ETag": encoded_etag(etag, encoding),
+            "Content-Encoding": encoding,
+            "Vary": "Accept-Encoding",
+        }
+        encoded = await note_list_cache.get(owner_id, f"{etag}:{encoding}")
+        if encoded is not None:
+            return RawJSONResponse(encoded, headers=encoded_headers)
+    
+    body = await note_list_cache.get(owner_id, etag)
+    if body is None:
+        result = await _paginate_notes(
+            db, criteria, page, size, cursor, total_strategy, owner_id, selected
+        )
+        body = note_page_adapter_for(selected).dump_json(result)
+        await note_list_cache.set(owner_id, etag, body)
+    
+    if encoding is not None and len(body) >= settings.COMPRESSION_MINIMUM_SIZE:
+        encoded = compress(body, encoding)
+        await note_list_cache.set(owner_id, f"{etag}:{encoding}", encoded)
+        return RawJSONResponse(encoded, headers=encoded_headers)
+    
+    return RawJSONResponse(body, headers=headers)
+
+
+def _export_response(
+    session_factory: async_sessionmaker,
+    criteria: List[ColumnElement],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Stream the notes matching `criteria` as a file download
+    """
+    return StreamingResponse(
+        stream_notes_export(session_factory, criteria, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
+
+
+async def _get_note_import(db: AsyncSession, owner_id: int, key: str) -> NoteImport:
+    """
+    Load the checkpoint of the import `key`, creating it on first use
+    """
+    query = select(NoteImport).where(NoteImport.owner_id == owner_id, NoteImport.key == key)
+    note_import = await db.scalar(query)
+    if note_import is None:
+        db.add(NoteImport(owner_id=owner_id, key=key))
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent upload with the same key created it first
+            await db.rollback()
+        note_import = await db.scalar(query)
+    return note_import
+
+
+async def _commit_import_chunk(
+    db: AsyncSession,
+    owner_id: int,
+    note_import: Optional[NoteImport],
+    rows: List[dict],
+    error_count: int,
+    committed_lines: int,
+    line_number: int,
+) -> None:
+    """
+    Insert one chunk of imported notes and advance the checkpoint in the same commit.
+
+    The checkpoint only moves forward from `committed_lines`, so two uploads
+    racing on the same key cannot both commit the same lines.
+    """
+    if rows:
+        await db.execute(insert(Note), rows)
+        await adjust_note_counters(
+            db, owner_id, len(rows), sum(description_bytes(row["description"]) for row in rows)
+        )
+    if note_import is not None:
+        advanced = await db.execute(
+            update(NoteImport)
+            .where(NoteImport.id == note_import.id, NoteImport.committed_lines == committed_lines)
+            .values(
+                committed_lines=line_number,
+                created=NoteImport.created + len(rows),
+                error_count=NoteImport.error_count + error_count,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if advanced.rowcount != 1:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Another upload with this import key is in progress"
+            )
+    await db.commit()
+    if rows:
+        await note_list_cache.invalidate([owner_id])
+
+
+async def _paginate_notes(
+    db: AsyncSession,
+    criteria: List[ColumnElement],
+    page: int,
+    size: int,
+    cursor: Optional[str],
+    total_strategy: Optional[TotalStrategy] = None,
+    owner_id: Optional[int] = None,
+    fields: Tuple[str, ...] = NOTE_FIELDS,
+) -> dict:
+    """
+    Paginate notes matching `criteria`, ordered by (created_at, id) descending.
+    Items are NoteRow dicts built from column tuples, ready for `note_page_adapter_for`.
+    Only the columns for `fields` (plus the keyset columns) are selected.
+
+    With a cursor the page is located with a keyset predicate instead of OFFSET,
+    so the cost does not grow with depth. Both modes return `next_cursor`.
+    Pass `owner_id` when `criteria` selects exactly one owner's notes so the
+    total comes from the denormalized counter.
+    """
+    total_strategy = total_strategy or TotalStrategy(settings.PAGINATION_TOTAL_STRATEGY)
+    if owner_id is not None and total_strategy != TotalStrategy.NONE:
+        # Per-user totals are kept on the users row, so they are exact and O(1)
+        total = await db.scalar(select(User.note_count).where(User.id == owner_id))
+        total_strategy = TotalStrategy.EXACT
+    else:
+        # count(*) over the filtered table lets the indexes answer the count
+        # without wrapping the ORM query.
+        total, total_strategy = await count_total(
+            db, select(func.count()).select_from(Note).where(*criteria), total_strategy
+        )
+    
+    # Calculate pages
+    total_pages = None
+    if total is not None:
+        total_pages = math.ceil(total / size) if total > 0 else 1
+    
+    ordered = select(*note_columns(fields, "created_at", "id")).where(*criteria).order_by(Note.created_at.desc(), Note.id.desc())
+    
+    if cursor is not None:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        ordered = ordered.where(
+            tuple_(Note.created_at, Note.id) < tuple_(cursor_created_at, cursor_id)
+        )
+        page = None
+    else:
+        # Ensure page is within bounds (only a reliable total can clamp)
+        if total_strategy in (TotalStrategy.EXACT, TotalStrategy.CACHED):
+            page = min(page, total_pages) if total > 0 else 1
+        
+        # Calculate offset
+        ordered = ordered.offset((page - 1) * size)
+    
+    # Fetch one extra row to know whether there is a next page
+    rows = (await db.execute(ordered.limit(size + 1))).all()
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    # Create pagination metadata
+    pagination_meta = PaginationMeta(
+        total=total,
+        page=page,
+        size=size,
+        pages=total_pages,
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+        total_strategy=total_strategy
+    )
+    
+    return {"items": note_rows(rows, fields), "meta": pagination_meta}
+
+
 @router.post(
     "/", 
     response_model=NoteResponse, 
@@ -28,10 +367,10 @@ router = APIRouter(prefix=f"{settings.API_V1_STR}/notes")
         422: {"description": "Validation error in input data"}
     }
 )
-def create_note(
+async def create_note(
     note_in: NoteCreate = Body(..., description="Note data to create"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Create a new note for the current user.
@@ -48,66 +387,504 @@ def create_note(
         owner_id=current_user.id
     )
     db.add(note)
-    db.commit()
-    db.refresh(note)
+    await adjust_note_counters(db, current_user.id, 1, description_bytes(note.description))
+    await db.commit()
+    await note_list_cache.invalidate([current_user.id])
+    await db.refresh(note)
     return note
 
 
+@router.post(
+    "/bulk",
+    response_model=NoteBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create Notes in Bulk",
+    description="Create many notes for the current authenticated user in one transaction.",
+    responses={
+        201: {"description": "Notes created successfully"},
+        401: {"description": "Not authenticated"},
+        422: {"description": "Validation error in input data"}
+    }
+)
+async def create_notes_bulk(
+    bulk_in: NoteBulkCreate = Body(..., description="Notes to create"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """
+    Create many notes for the current user.
+    
+    - **items**: Notes to create, each with a title and optional description
+    - **partial**: If true, create the valid items and report the invalid ones
+    
+    Returns:
+    - Created notes in request order, plus per-item errors in partial mode
+    
+    Notes:
+    - Without `partial`, any invalid item rejects the whole batch
+    - All notes are written with batched multi-row INSERT ... RETURNING
+      statements in a single transaction
+    """
+    rows = []
+    errors = []
+    for index, item in enumerate(bulk_in.items):
+        try:
+            note_in = NoteCreate.model_validate(item)
+        except ValidationError as exc:
+            errors.append(NoteBulkError(
+                index=index,
+                errors=exc.errors(include_url=False, include_context=False, include_input=False)
+            ))
+            continue
+        rows.append({
+            "title": note_in.title,
+            "description": note_in.description,
+            "owner_id": current_user.id
+        })
+    
+    if errors and not bulk_in.partial:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors]
+        )
+    
+    notes = []
+    if rows:
+        notes = (await db.scalars(
+            insert(Note).returning(Note, sort_by_parameter_order=True), rows
+        )).all()
+        await adjust_note_counters(
+            db,
+            current_user.id,
+            len(rows),
+            sum(description_bytes(row["description"]) for row in rows)
+        )
+        await db.commit()
+        await note_list_cache.invalidate([current_user.id])
+    
+    return {"items": notes, "errors": errors}
+
+
+@router.put(
+    "/bulk",
+    response_model=NoteBulkResult,
+    summary="Update Notes in Bulk",
+    description="Update many notes selected by ID and/or creation time. Users can only update their own notes unless they are admins.",
+    responses={
+        200: {"description": "Notes updated successfully"},
+        401: {"description": "Not authenticated"},
+        422: {"description": "Validation error in input data"}
+    }
+)
+async def update_notes_bulk(
+    bulk_in: NoteBulkUpdate = Body(..., description="Notes to update and the new values"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """
+    Update many notes with a single UPDATE statement.
+    
+    - **ids**: Optional IDs of the notes to update
+    - **created_before**: Optional cutoff; only older notes are updated
+    - **title**: Optional new title
+    - **description**: Optional new description
+    
+    Returns:
+    - IDs that were updated, forbidden (owned by another user) or missing
+    
+    Notes:
+    - Regular users can only update their own notes
+    - Admin users can update any note
+    """
+    criteria = _bulk_criteria(bulk_in)
+    scope = list(criteria)
+    if current_user.role != UserRole.ADMIN:
+        scope.append(Note.owner_id == current_user.id)
+    
+    values = {}
+    if bulk_in.title is not None:
+        values["title"] = bulk_in.title
+    if bulk_in.description is not None:
+        values["description"] = bulk_in.description
+    
+    old_bytes = {}
+    if bulk_in.description is not None:
+        old_bytes = dict((await db.execute(
+            _locked_bytes_by_owner(scope, db.get_bind().dialect.name)
+        )).all())
+    
+    rows = (await db.execute(
+        update(Note)
+        .where(*scope)
+        .values(**values)
+        .returning(Note.id, Note.owner_id)
+        .execution_options(synchronize_session=False)
+    )).all()
+    
+    if bulk_in.description is not None:
+        new_bytes = description_bytes(bulk_in.description)
+        bytes_deltas = {}
+        for _, owner_id in rows:
+            bytes_deltas[owner_id] = bytes_deltas.get(owner_id, 0) + new_bytes
+        await adjust_note_counters_many(db, {
+            owner_id: (0, total - old_bytes.get(owner_id, 0))
+            for owner_id, total in bytes_deltas.items()
+        })
+    
+    result = await _bulk_result(db, bulk_in, criteria, [row[0] for row in rows], current_user)
+    await db.commit()
+    if rows:
+        await note_list_cache.invalidate(row[1] for row in rows)
+    return result
+
+
+@router.delete(
+    "/bulk",
+    response_model=NoteBulkResult,
+    summary="Delete Notes in Bulk",
+    description="Delete many notes selected by ID and/or creation time. Users can only delete their own notes unless they are admins.",
+    responses={
+        200: {"description": "Notes deleted successfully"},
+        401: {"description": "Not authenticated"},
+        422: {"description": "Validation error in input data"}
+    }
+)
+async def delete_notes_bulk(
+    bulk_in: NoteBulkSelector = Body(..., description="Notes to delete"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """
+    Delete many notes with a single DELETE statement.
+    
+    - **ids**: Optional IDs of the notes to delete
+    - **created_before**: Optional cutoff; only older notes are deleted
+    
+    Returns:
+    - IDs that were deleted, forbidden (owned by another user) or missing
+    
+    Notes:
+    - Regular users can only delete their own notes
+    - Admin users can delete any note
+    """
+    criteria = _bulk_criteria(bulk_in)
+    scope = list(criteria)
+    if current_user.role != UserRole.ADMIN:
+        scope.append(Note.owner_id == current_user.id)
+    
+    rows = (await db.execute(
+        delete(Note)
+        .where(*scope)
+        .returning(Note.id, Note.owner_id, description_bytes_expr(db.get_bind().dialect.name))
+        .execution_options(synchronize_session=False)
+    )).all()
+    
+    deltas = {}
+    for _, owner_id, size in rows:
+        count, total_bytes = deltas.get(owner_id, (0, 0))
+        deltas[owner_id] = (count - 1, total_bytes - size)
+    await adjust_note_counters_many(db, deltas)
+    
+    result = await _bulk_result(db, bulk_in, criteria, [row[0] for row in rows], current_user)
+    await db.commit()
+    if rows:
+        await note_list_cache.invalidate(row[1] for row in rows)
+    return result
+
+
+@router.post(
+    "/import",
+    response_model=NoteImportResult,
+    summary="Import Notes",
+    description="Create notes for the current authenticated user from an NDJSON upload, committing in chunks.",
+    responses={
+        200: {"description": "Upload processed; see the per-line errors"},
+        401: {"description": "Not authenticated"},
+        409: {"description": "Another upload with the same import key is in progress"},
+        413: {"description": "A line exceeds the maximum line size"}
+    },
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+            "description": "One NoteCreate object per line"
+        }
+    }
+)
+async def import_notes(
+    request: Request,
+    key: Optional[str] = Query(
+        None, min_length=1, max_length=64, description="Import key; re-send the upload with the same key to resume it"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """
+    Import notes from a newline-delimited JSON upload.
+    
+    - **key**: Optional import key that makes the upload resumable
+    
+    Returns:
+    - Lines read and committed, notes created and the rejected lines
+    
+    Notes:
+    - The body is read as a stream and parsed line by line; each line is validated
+      against NoteCreate and invalid lines are reported instead of failing the upload
+    - Valid notes are inserted and committed in chunks of NOTES_IMPORT_CHUNK_SIZE
+    - With a key, each commit also records how many lines it covers. If the upload
+      is interrupted, send the same file with the same key and the committed lines
+      are skipped; progress can be checked at `GET /notes/import/{key}`
+    """
+    # Every chunk runs the same INSERT and checkpoint UPDATE by design
+    allow_repeated_queries()
+    
+    note_import = None
+    committed_lines = 0
+    if key is not None:
+        note_import = await _get_note_import(db, current_user.id, key)
+        committed_lines = note_import.committed_lines
+    resume_from = committed_lines
+    
+    lines_read = 0
+    created = 0
+    error_count = 0
+    errors = []
+    rows = []
+    chunk_errors = 0
+    try:
+        async for line_number, line in iter_ndjson_lines(
+            request.stream(), settings.NOTES_IMPORT_MAX_LINE_BYTES
+        ):
+            lines_read = line_number
+            if line_number <= resume_from or not line.strip():
+                continue
+            
+            try:
+                note_in = NoteCreate.model_validate_json(line)
+            except ValidationError as exc:
+                chunk_errors += 1
+                if len(errors) < settings.NOTES_IMPORT_MAX_ERRORS:
+                    errors.append(NoteImportLineError(
+                        line=line_number,
+                        errors=exc.errors(include_url=False, include_context=False, include_input=False)
+                    ))
+                continue
+            rows.append({
+                "title": note_in.title,
+                "description": note_in.description,
+                "owner_id": current_user.id
+            })
+            
+            if len(rows) >= settings.NOTES_IMPORT_CHUNK_SIZE:
+                await _commit_import_chunk(
+                    db, current_user.id, note_import, rows, chunk_errors, committed_lines, line_number
+                )
+                created += len(rows)
+                error_count += chunk_errors
+                committed_lines = line_number
+                rows = []
+                chunk_errors = 0
+    except LineTooLong as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail={"message": str(exc), "committed_lines": committed_lines}
+        )
+    
+    if lines_read > committed_lines:
+        await _commit_import_chunk(
+            db, current_user.id, note_import, rows, chunk_errors, committed_lines, lines_read
+        )
+        created += len(rows)
+        error_count += chunk_errors
+        committed_lines = lines_read
+    
+    return {
+        "key": key,
+        "lines_read": lines_read,
+        "skipped_lines": min(resume_from, lines_read),
+        "committed_lines": committed_lines,
+        "created": created,
+        "error_count": error_count,
+        "errors": errors
+    }
+
+
+@router.get(
+    "/import/{key}",
+    response_model=NoteImportProgress,
+    summary="Get Import Progress",
+    description="Get how far a resumable import has been committed.",
+    responses={
+        200: {"description": "Import progress retrieved successfully"},
+        401: {"description": "Not authenticated"},
+        404: {"description": "Import not found"}
+    }
+)
+async def get_import_progress(
+    key: str = Path(..., title="Import key", description="The key the upload was sent with"),
+    # Progress is read from the writer: it decides where a resumed upload starts
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """
+    Get the progress of one of the current user's imports.
+    
+    - **key**: The key the upload was sent with
+    
+    Returns:
+    - Committed lines, notes created and lines rejected so far
+    """
+    note_import = await db.scalar(
+        select(NoteImport).where(NoteImport.owner_id == current_user.id, NoteImport.key == key)
+    )
+    if not note_import:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import not found"
+        )
+    
+    return note_import
+
+
 @router.get(
     "/", 
-    response_model=PaginatedResponse[NoteResponse],
+    response_model=PaginatedResponse[Union[NoteResponse, NoteSparseResponse]],
     summary="List Notes",
     description="Get paginated list of notes. Admins can see all notes, regular users can only see their own.",
     responses={
-        200: {"description": "List of notes retrieved successfully"},
+        200: {"description": "List of notes retrieved successfully; with `fields`, items carry only those fields"},
+        304: {"description": "Not modified since the ETag the client holds"},
+        400: {"description": "Invalid cursor or unknown field"},
         401: {"description": "Not authenticated"}
     }
 )
-def get_notes(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+async def get_notes(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_active_user),
     page: int = Query(1, gt=0, description="Page number, starting from 1"),
-    size: int = Query(10, gt=0, le=100, description="Number of items per page (max 100)")
+    size: int = Query(10, gt=0, le=100, description="Number of items per page (max 100)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from `meta.next_cursor`; overrides `page`"),
+    total: Optional[TotalStrategy] = Query(None, description="How to compute `meta.total` (defaults to the server setting)"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated note fields to return, e.g. `id,title,updated_at` (default: all)"
+    )
 ) -> Any:
     """
     Get paginated notes - if admin, get all notes, otherwise get only user's notes.
     
     - **page**: Page number (starting from 1)
     - **size**: Number of items per page (max 100)
+    - **cursor**: Optional cursor returned as `meta.next_cursor` by a previous page
+    - **total**: Total strategy - exact, estimated, cached or none
+    - **fields**: Optional sparse fieldset; unlisted columns are not even selected
     
     Returns:
     - Paginated list of notes with pagination metadata
+    
+    Notes:
+    - Responses carry an ETag; a matching If-None-Match gets an empty 304
+    - Pages are served from the note list cache until the owner's notes change
     """
     # Build query based on user role
     if current_user.role == UserRole.ADMIN:
-        query = db.query(Note)
+        criteria = []
+        owner_id = None
     else:
-        query = db.query(Note).filter(Note.owner_id == current_user.id)
-    
-    # Calculate total for pagination
-    total = query.count()
+        criteria = [Note.owner_id == current_user.id]
+        owner_id = current_user.id
     
-    # Calculate pages
-    total_pages = math.ceil(total / size) if total > 0 else 1
+    return await _list_response(db, request, criteria, page, size, cursor, total, owner_id, fields)
+
+
+@router.get(
+    "/search",
+    response_model=PaginatedResponse[NoteResponse],
+    summary="Search Notes",
+    description="Full-text search over note titles and descriptions, best match first. Admins search all notes, regular users only their own.",
+    responses={
+        200: {"description": "Matching notes retrieved successfully"},
+        401: {"description": "Not authenticated"},
+        422: {"description": "Missing or invalid search query"}
+    }
+)
+async def search_notes(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_active_user),
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    page: int = Query(1, gt=0, description="Page number, starting from 1"),
+    size: int = Query(10, gt=0, le=100, description="Number of items per page (max 100)")
+) -> Any:
+    """
+    Search notes by title and description.
     
-    # Ensure page is within bounds
-    page = min(page, total_pages) if total > 0 else 1
+    - **q**: Search terms; all terms must match
+    - **page**: Page number (starting from 1)
+    - **size**: Number of items per page (max 100)
     
-    # Calculate offset
-    offset = (page - 1) * size
+    Returns:
+    - Ranked page of matching notes; `meta.has_more` tells whether more matches follow
     
-    # Get paginated results
-    notes = query.order_by(Note.created_at.desc()).offset(offset).limit(size).all()
+    Notes:
+    - Regular users only search their own notes
+    - Admin users search all notes
+    - Titles weigh more than descriptions in the ranking
+    """
+    if not q.split():
+        rows = []
+    else:
+        query = build_note_search(db.get_bind().dialect.name, q).with_only_columns(*NOTE_COLUMNS)
+        if current_user.role != UserRole.ADMIN:
+            query = query.where(Note.owner_id == current_user.id)
+        
+        # Fetch one extra row to know whether there is a next page;
+        # counting every match would cost as much as the search itself
+        rows = (await db.execute(query.offset((page - 1) * size).limit(size + 1))).all()
     
-    # Create pagination metadata
     pagination_meta = PaginationMeta(
-        total=total,
         page=page,
         size=size,
-        pages=total_pages
+        has_more=len(rows) > size,
+        total_strategy=TotalStrategy.NONE
     )
     
-    return {"items": notes, "meta": pagination_meta}
+    return RawJSONResponse(
+        note_page_adapter.dump_json({"items": note_rows(rows[:size]), "meta": pagination_meta})
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export Notes",
+    description="Stream the current user's notes as NDJSON or CSV, oldest first.",
+    responses={
+        200: {
+            "description": "Notes streamed successfully",
+            "content": {"application/x-ndjson": {}, "text/csv": {}}
+        },
+        401: {"description": "Not authenticated"}
+    }
+)
+async def export_notes(
+    session_factory: async_sessionmaker = Depends(get_async_read_sessionmaker),
+    current_user: Principal = Depends(get_current_active_user),
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Export format - ndjson or csv")
+) -> Any:
+    """
+    Export all of the current user's notes.
+    
+    - **format**: ndjson (one note object per line) or csv (with a header row)
+    
+    Returns:
+    - Streamed file with every note the user owns
+    
+    Notes:
+    - Notes are read from a server-side cursor in batches, so exports of any size
+      use constant memory
+    """
+    return _export_response(
+        session_factory, [Note.owner_id == current_user.id], format, f"notes-{current_user.id}"
+    )
 
 
 @router.get(
@@ -117,15 +894,17 @@ def get_notes(
     description="Get a specific note by ID. Users can only access their own notes unless they are admins.",
     responses={
         200: {"description": "Note retrieved successfully"},
+        304: {"description": "Not modified since the ETag or date the client holds"},
         404: {"description": "Note not found"},
         403: {"description": "Permission denied - note belongs to another user"},
         401: {"description": "Not authenticated"}
     }
 )
-def get_note(
+async def get_note(
+    request: Request,
     note_id: int = Path(..., title="Note ID", description="The ID of the note to retrieve"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Get a specific note by ID.
@@ -138,8 +917,10 @@ def get_note(
     Notes:
     - Regular users can only access their own notes
     - Admin users can access any note
+    - Responses carry ETag and Last-Modified; a matching If-None-Match or
+      If-Modified-Since gets an empty 304
     """
-    note = db.query(Note).filter(Note.id == note_id).first()
+    note = await db.get(Note, note_id)
     if not note:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -153,7 +934,13 @@ def get_note(
             detail="Permission denied"
         )
     
-    return note
+    etag = _note_etag(note)
+    if is_not_modified(request, etag, note.updated_at):
+        return not_modified_response(etag, note.updated_at)
+    
+    return RawJSONResponse(
+        note_adapter.dump_json(note_row(note)), headers=cache_headers(etag, note.updated_at)
+    )
 
 
 @router.put(
@@ -166,14 +953,17 @@ def get_note(
         404: {"description": "Note not found"},
         403: {"description": "Permission denied - note belongs to another user"},
         401: {"description": "Not authenticated"},
+        412: {"description": "If-Match does not match the note's current ETag"},
         422: {"description": "Validation error in input data"}
     }
 )
-def update_note(
+async def update_note(
+    request: Request,
+    response: Response,
     note_id: int = Path(..., title="Note ID", description="The ID of the note to update"),
     note_in: NoteUpdate = Body(..., description="Updated note data"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Update a note.
@@ -189,8 +979,9 @@ def update_note(
     - Regular users can only update their own notes
     - Admin users can update any note
     - Fields that are not provided will remain unchanged
+    - With If-Match, the update only applies if the note's ETag still matches
     """
-    note = db.query(Note).filter(Note.id == note_id).first()
+    note = await db.get(Note, note_id)
     if not note:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -204,14 +995,20 @@ def update_note(
             detail="Permission denied"
         )
     
+    check_if_match(request, _note_etag(note))
+    
     # Update note fields
     if note_in.title is not None:
         note.title = note_in.title
     if note_in.description is not None:
+        bytes_delta = description_bytes(note_in.description) - description_bytes(note.description)
+        await adjust_note_counters(db, note.owner_id, 0, bytes_delta)
         note.description = note_in.description
     
-    db.commit()
-    db.refresh(note)
+    await db.commit()
+    await note_list_cache.invalidate([note.owner_id])
+    await db.refresh(note)
+    response.headers.update(cache_headers(_note_etag(note), note.updated_at))
     return note
 
 
@@ -224,13 +1021,15 @@ def update_note(
         200: {"description": "Note deleted successfully"},
         404: {"description": "Note not found"},
         403: {"description": "Permission denied - note belongs to another user"},
-        401: {"description": "Not authenticated"}
+        401: {"description": "Not authenticated"},
+        412: {"description": "If-Match does not match the note's current ETag"}
     }
 )
-def delete_note(
+async def delete_note(
+    request: Request,
     note_id: int = Path(..., title="Note ID", description="The ID of the note to delete"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Delete a note.
@@ -243,8 +1042,9 @@ def delete_note(
     Notes:
     - Regular users can only delete their own notes
     - Admin users can delete any note
+    - With If-Match, the note is only deleted if its ETag still matches
     """
-    note = db.query(Note).filter(Note.id == note_id).first()
+    note = await db.get(Note, note_id)
     if not note:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -258,29 +1058,41 @@ def delete_note(
             detail="Permission denied"
         )
     
-    db.delete(note)
-    db.commit()
+    check_if_match(request, _note_etag(note))
+    
+    await db.delete(note)
+    await adjust_note_counters(db, note.owner_id, -1, -description_bytes(note.description))
+    await db.commit()
+    await note_list_cache.invalidate([note.owner_id])
     return {"message": "Note deleted successfully"}
 
 
 @router.get(
     "/by-user/{user_id}", 
-    response_model=PaginatedResponse[NoteResponse],
+    response_model=PaginatedResponse[Union[NoteResponse, NoteSparseResponse]],
     summary="List Notes by User (Admin Only)",
     description="Get paginated list of notes for a specific user. Admin access only.",
     responses={
-        200: {"description": "List of notes retrieved successfully"},
+        200: {"description": "List of notes retrieved successfully; with `fields`, items carry only those fields"},
+        304: {"description": "Not modified since the ETag the client holds"},
+        400: {"description": "Invalid cursor or unknown field"},
         401: {"description": "Not authenticated"},
         403: {"description": "Permission denied - admin access required"},
         404: {"description": "User not found"}
     }
 )
-def get_notes_by_user(
+async def get_notes_by_user(
+    request: Request,
     user_id: int = Path(..., title="User ID", description="The ID of the user whose notes to retrieve"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_active_user),
     page: int = Query(1, gt=0, description="Page number, starting from 1"),
-    size: int = Query(10, gt=0, le=100, description="Number of items per page (max 100)")
+    size: int = Query(10, gt=0, le=100, description="Number of items per page (max 100)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from `meta.next_cursor`; overrides `page`"),
+    total: Optional[TotalStrategy] = Query(None, description="How to compute `meta.total` (defaults to the server setting)"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated note fields to return, e.g. `id,title,updated_at` (default: all)"
+    )
 ) -> Any:
     """
     Get paginated notes for a specific user (Admin only).
@@ -288,12 +1100,16 @@ def get_notes_by_user(
     - **user_id**: The ID of the user whose notes to retrieve
     - **page**: Page number (starting from 1)
     - **size**: Number of items per page (max 100)
+    - **cursor**: Optional cursor returned as `meta.next_cursor` by a previous page
+    - **total**: Total strategy - exact, estimated, cached or none
+    - **fields**: Optional sparse fieldset; unlisted columns are not even selected
     
     Returns:
     - Paginated list of notes with pagination metadata
     
     Notes:
     - Requires admin role
+    - Supports conditional requests and caching like `GET /notes/`
     """
     # Check if user is admin
     if current_user.role != UserRole.ADMIN:
@@ -304,37 +1120,57 @@ def get_notes_by_user(
     
     # Check if the user exists - this is an optional check that could be removed
     # if you don't want to expose whether a user ID exists or not
-    user_exists = db.query(User).filter(User.id == user_id).first()
+    user_exists = await db.get(User, user_id)
     if not user_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    # Build query for the specific user's notes
-    query = db.query(Note).filter(Note.owner_id == user_id)
-    
-    # Calculate total for pagination
-    total = query.count()
-    
-    # Calculate pages
-    total_pages = math.ceil(total / size) if total > 0 else 1
+    # Build criteria for the specific user's notes
+    criteria = [Note.owner_id == user_id]
     
-    # Ensure page is within bounds
-    page = min(page, total_pages) if total > 0 else 1
+    return await _list_response(db, request, criteria, page, size, cursor, total, user_id, fields)
+
+
+@router.get(
+    "/by-user/{user_id}/export",
+    response_class=StreamingResponse,
+    summary="Export Notes by User (Admin Only)",
+    description="Stream a specific user's notes as NDJSON or CSV, oldest first. Admin access only.",
+    responses={
+        200: {
+            "description": "Notes streamed successfully",
+            "content": {"application/x-ndjson": {}, "text/csv": {}}
+        },
+        401: {"description": "Not authenticated"},
+        403: {"description": "Permission denied - admin access required"},
+        404: {"description": "User not found"}
+    }
+)
+async def export_notes_by_user(
+    user_id: int = Path(..., title="User ID", description="The ID of the user whose notes to export"),
+    db: AsyncSession = Depends(get_async_read_db),
+    session_factory: async_sessionmaker = Depends(get_async_read_sessionmaker),
+    admin: Principal = Depends(get_admin_user),
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Export format - ndjson or csv")
+) -> Any:
+    """
+    Export all notes of a specific user (Admin only).
     
-    # Calculate offset
-    offset = (page - 1) * size
+    - **user_id**: The ID of the user whose notes to export
+    - **format**: ndjson (one note object per line) or csv (with a header row)
     
-    # Get paginated results
-    notes = query.order_by(Note.created_at.desc()).offset(offset).limit(size).all()
+    Returns:
+    - Streamed file with every note the user owns
     
-    # Create pagination metadata
-    pagination_meta = PaginationMeta(
-        total=total,
-        page=page,
-        size=size,
-        pages=total_pages
-    )
+    Notes:
+    - Requires admin role
+    """
+    if not await db.get(User, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
     
-    return {"items": notes, "meta": pagination_meta}
\ No newline at end of file
+    return _export_response(session_factory, [Note.owner_id == user_id], format, f"notes-{user_id}")
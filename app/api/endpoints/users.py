@@ -1,29 +1,32 @@
-from typing import Any, List, Optional
+from typing import Any, Optional
 import math
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.deps import get_admin_user
-from app.db.session import get_db
+from app.core.deps import Principal, get_admin_user, remember_principal, revoke_tokens
+from app.db.session import get_async_db, get_async_read_db
+from app.models.note import Note
 from app.models.user import User, UserRole
 from app.schemas.user import (
-    UserResponse, UserDetailResponse, UserUpdateRole, UserUpdateStatus,
-    PaginatedResponse, PaginationMeta
+    UserResponse, UserDetailResponse, UserNoteStats, UserUpdateRole, UserUpdateStatus,
+    PaginatedResponse, PaginationMeta, TotalStrategy
 )
+from app.utils.pagination import count_total, encode_cursor
 
 router = APIRouter(prefix=f"{settings.API_V1_STR}/admin/users")
 
 
 @router.get("/", response_model=PaginatedResponse[UserResponse], summary="List Users", description="Get a paginated list of all users with optional filtering by role and active status.")
-def get_users(
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+async def get_users(
+    db: AsyncSession = Depends(get_async_read_db),
+    admin: Principal = Depends(get_admin_user),
     page: int = Query(1, gt=0, description="Page number, starting from 1"),
     size: int = Query(10, gt=0, le=100, description="Number of items per page (max 100)"),
     role: Optional[str] = Query(None, description="Filter by role (admin or user)"),
-    is_active: Optional[bool] = Query(None, description="Filter by active status (true/false)")
+    is_active: Optional[bool] = Query(None, description="Filter by active status (true/false)"),
+    total: Optional[TotalStrategy] = Query(None, description="How to compute `meta.total` (defaults to the server setting)")
 ) -> Any:
     """
     Retrieve a paginated list of users with optional filtering.
@@ -32,41 +35,53 @@ def get_users(
     - **size**: Number of items per page (max 100)
     - **role**: Optional filter by user role ('admin' or 'user')
     - **is_active**: Optional filter by account status
+    - **total**: Total strategy - exact, estimated, cached or none
     
     Returns:
     - Paginated list of users with pagination metadata
     
     Only accessible by admin users.
     """
-    query = db.query(User)
+    criteria = []
     
     # Apply filters if provided
     if role:
-        query = query.filter(User.role == role)
+        criteria.append(User.role == role)
     if is_active is not None:
-        query = query.filter(User.is_active == is_active)
+        criteria.append(User.is_active == is_active)
     
     # Calculate total for pagination
-    total = query.count()
+    total, total_strategy = await count_total(
+        db, select(func.count()).select_from(User).where(*criteria), total
+    )
     
     # Calculate pages
-    total_pages = math.ceil(total / size) if total > 0 else 1
+    total_pages = None
+    if total is not None:
+        total_pages = math.ceil(total / size) if total > 0 else 1
     
-    # Ensure page is within bounds
-    page = min(page, total_pages) if total > 0 else 1
+    # Ensure page is within bounds (only a reliable total can clamp)
+    if total_strategy in (TotalStrategy.EXACT, TotalStrategy.CACHED):
+        page = min(page, total_pages) if total > 0 else 1
     
     # Calculate offset
     offset = (page - 1) * size
     
-    # Get paginated results
-    users = query.offset(offset).limit(size).all()
+    # Get paginated results, plus one row to know whether there is a next page
+    users = (await db.scalars(
+        select(User).where(*criteria).order_by(User.id).offset(offset).limit(size + 1)
+    )).all()
+    has_more = len(users) > size
+    users = users[:size]
     
     # Create pagination metadata
     pagination_meta = PaginationMeta(
         total=total,
         page=page,
         size=size,
-        pages=total_pages
+        pages=total_pages,
+        has_more=has_more,
+        total_strategy=total_strategy
     )
     
     return {"items": users, "meta": pagination_meta}
@@ -76,36 +91,73 @@ def get_users(
     "/{user_id}", 
     response_model=UserDetailResponse,
     summary="Get User Details",
-    description="Get detailed information about a specific user, including their notes.",
+    description="Get detailed information about a specific user, including their most recent notes and note statistics.",
     responses={
         200: {"description": "User details retrieved successfully"},
         404: {"description": "User not found"},
         403: {"description": "Not enough permissions, admin role required"}
     }
 )
-def get_user_details(
+async def get_user_details(
     user_id: int = Path(..., title="User ID", description="The ID of the user to retrieve"),
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
+    notes_limit: int = Query(10, gt=0, le=100, description="Number of recent notes to embed (max 100)"),
+    db: AsyncSession = Depends(get_async_read_db),
+    admin: Principal = Depends(get_admin_user)
 ) -> Any:
     """
-    Get detailed information about a specific user, including their notes.
+    Get detailed information about a specific user, including their most recent notes.
     
     - **user_id**: The ID of the user to retrieve
+    - **notes_limit**: Number of recent notes to embed (max 100)
     
     Returns:
-    - Detailed user information including profile data and notes
+    - Detailed user information including profile data, the most recent notes,
+      a link to the rest of them and note statistics
     
     Only accessible by admin users.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    return user
+    # Newest notes first, plus one row to know whether more follow; this is the
+    # first page of /notes/by-user/{user_id}, so its cursor continues there
+    notes = (await db.execute(
+        select(Note.id, Note.title, Note.created_at, Note.updated_at)
+        .where(Note.owner_id == user_id)
+        .order_by(Note.created_at.desc(), Note.id.desc())
+        .limit(notes_limit + 1)
+    )).all()
+    next_cursor = None
+    next_link = None
+    if len(notes) > notes_limit:
+        notes = notes[:notes_limit]
+        next_cursor = encode_cursor(notes[-1].created_at, notes[-1].id)
+        next_link = f"{settings.API_V1_STR}/notes/by-user/{user_id}?size={notes_limit}&cursor={next_cursor}"
+    
+    # The count is the denormalized counter; the bounds are single index
+    # probes on the owner's created_at and updated_at indexes
+    stats = UserNoteStats(count=user.note_count)
+    if notes:
+        stats.last_note_at = notes[0].created_at
+        stats.first_note_at, stats.last_activity_at = (await db.execute(
+            select(
+                select(func.min(Note.created_at)).where(Note.owner_id == user_id).scalar_subquery(),
+                select(func.max(Note.updated_at)).where(Note.owner_id == user_id).scalar_subquery()
+            )
+        )).one()
+    
+    return UserDetailResponse(
+        **UserResponse.model_validate(user).model_dump(),
+        updated_at=user.updated_at,
+        notes=notes,
+        notes_next_cursor=next_cursor,
+        notes_next=next_link,
+        note_stats=stats
+    )
 
 
 @router.put(
@@ -120,11 +172,11 @@ def get_user_details(
         403: {"description": "Not enough permissions, admin role required"}
     }
 )
-def update_user_role(
+async def update_user_role(
     user_id: int = Path(..., title="User ID", description="The ID of the user to update"),
     role_update: UserUpdateRole = Body(..., description="New role information"),
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(get_admin_user)
 ) -> Any:
     """
     Update a user's role. Only admins can set other users as admins.
@@ -138,8 +190,11 @@ def update_user_role(
     Notes:
     - Admins cannot demote themselves
     - Only valid roles ('admin' or 'user') are accepted
+    - A role change revokes the user's tokens. The worker handling this call
+      applies it at once; other workers pick it up within
+      TOKEN_DENYLIST_SYNC_SECONDS
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -160,9 +215,16 @@ def update_user_role(
             detail="Admins cannot demote themselves"
         )
     
+    # Tokens carry the role claim, so a role change revokes them
+    if user.role != role_update.role:
+        revoke_tokens(user)
+    
     user.role = role_update.role
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    
+    # Replace the cached principal so the new role applies to the next request
+    remember_principal(user)
     return user
 
 
@@ -178,11 +240,11 @@ def update_user_role(
         403: {"description": "Not enough permissions, admin role required"}
     }
 )
-def update_user_status(
+async def update_user_status(
     user_id: int = Path(..., title="User ID", description="The ID of the user to update"),
     status_update: UserUpdateStatus = Body(..., description="New status information"),
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(get_admin_user)
 ) -> Any:
     """
     Activate or deactivate a user account.
@@ -195,8 +257,13 @@ def update_user_status(
     
     Notes:
     - Admins cannot deactivate their own account
+    - Deactivation revokes the user's tokens. The worker handling this call
+      applies it at once; other workers pick it up within
+      TOKEN_DENYLIST_SYNC_SECONDS
+    - Reactivation can take up to PRINCIPAL_CACHE_TTL_SECONDS to reach other
+      workers
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -210,7 +277,14 @@ def update_user_status(
             detail="Admins cannot deactivate themselves"
         )
     
+    # Deactivation revokes every token the user holds
+    if user.is_active and not status_update.is_active:
+        revoke_tokens(user)
+    
     user.is_active = status_update.is_active
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    
+    # Replace the cached principal so deactivation applies to the next request
+    remember_principal(user)
     return user
\ No newline at end of file
@@ -7,7 +7,22 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Notes Application"
     API_V1_STR: str = "/api/v1"
-    
+
+    # "development" runs one auto-reloading process; anything else runs the
+    # production server (see run.py)
+    ENVIRONMENT: str = os.environ.get("ENVIRONMENT", "development")
+
+    # Server settings. WEB_CONCURRENCY=0 sizes the worker count to the CPUs
+    # the container may use. SERVER_KEEPALIVE_SECONDS should exceed the load
+    # balancer's idle timeout (60s on an ALB) so it never reuses a connection
+    # the server has just closed.
+    HOST: str = os.environ.get("HOST", "0.0.0.0")
+    PORT: int = int(os.environ.get("PORT", "8000"))
+    WEB_CONCURRENCY: int = int(os.environ.get("WEB_CONCURRENCY", "0"))
+    SERVER_KEEPALIVE_SECONDS: int = int(os.environ.get("SERVER_KEEPALIVE_SECONDS", "65"))
+    SERVER_BACKLOG: int = int(os.environ.get("SERVER_BACKLOG", "2048"))
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = int(os.environ.get("SERVER_GRACEFUL_TIMEOUT_SECONDS", "25"))
+
     # Standard Database settings
     POSTGRES_SERVER: str = os.environ.get("POSTGRES_SERVER", "localhost")
     POSTGRES_USER: str = os.environ.get("POSTGRES_USER", "postgres")
@@ -38,10 +53,116 @@ class Settings(BaseSettings):
             return f"postgresql://{self.AURORA_USER}:{self.AURORA_PASSWORD}@{self.AURORA_READER_ENDPOINT}:{self.AURORA_PORT}/{self.AURORA_DB}"
         return self.SQLALCHEMY_DATABASE_URI
     
+    # Async database URIs (asyncpg driver) used by the API endpoints
+    @property
+    def ASYNC_SQLALCHEMY_DATABASE_URI(self) -> str:
+        """Returns the primary database URI for the asyncio driver"""
+        return self.SQLALCHEMY_DATABASE_URI.replace("postgresql://", "postgresql+asyncpg://", 1)
+    
+    @property
+    def ASYNC_SQLALCHEMY_READER_URI(self) -> str:
+        """Returns the reader database URI for the asyncio driver"""
+        return self.SQLALCHEMY_READER_URI.replace("postgresql://", "postgresql+asyncpg://", 1)
+    
+    # Connection pools, sized per engine; a task holds up to POOL_SIZE +
+    # MAX_OVERFLOW connections to each endpoint. Connections idle for
+    # DB_POOL_PING_IDLE_SECONDS are pinged on checkout instead of every
+    # checkout, and are replaced after DB_POOL_RECYCLE_SECONDS. Statement
+    # timeouts are set per connection (0 disables them).
+    DB_WRITER_POOL_SIZE: int = int(os.environ.get("DB_WRITER_POOL_SIZE", "5"))
+    DB_WRITER_MAX_OVERFLOW: int = int(os.environ.get("DB_WRITER_MAX_OVERFLOW", "10"))
+    DB_WRITER_STATEMENT_TIMEOUT_MS: int = int(os.environ.get("DB_WRITER_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_READER_POOL_SIZE: int = int(os.environ.get("DB_READER_POOL_SIZE", "10"))
+    DB_READER_MAX_OVERFLOW: int = int(os.environ.get("DB_READER_MAX_OVERFLOW", "10"))
+    DB_READER_STATEMENT_TIMEOUT_MS: int = int(os.environ.get("DB_READER_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_POOL_TIMEOUT_SECONDS: int = int(os.environ.get("DB_POOL_TIMEOUT_SECONDS", "10"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.environ.get("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PING_IDLE_SECONDS: int = int(os.environ.get("DB_POOL_PING_IDLE_SECONDS", "30"))
+    # Checkouts slower than this are logged (0 disables the warning)
+    DB_POOL_SLOW_CHECKOUT_MS: int = int(os.environ.get("DB_POOL_SLOW_CHECKOUT_MS", "100"))
+    
+    # Read routing settings
+    # After a write, the client's reads go to the writer for this many seconds
+    # so replica lag never shows stale data (0 disables stickiness)
+    READ_YOUR_WRITES_SECONDS: int = int(os.environ.get("READ_YOUR_WRITES_SECONDS", "5"))
+    READ_YOUR_WRITES_COOKIE: str = "notes_last_write"
+    READ_YOUR_WRITES_HEADER: str = "X-Last-Write"
+    
+    # Pagination totals: exact, estimated (planner statistics), cached or none.
+    # Cached totals are memoized per filter for PAGINATION_COUNT_CACHE_SECONDS.
+    PAGINATION_TOTAL_STRATEGY: str = os.environ.get("PAGINATION_TOTAL_STRATEGY", "exact")
+    PAGINATION_COUNT_CACHE_SECONDS: int = int(os.environ.get("PAGINATION_COUNT_CACHE_SECONDS", "30"))
+    PAGINATION_COUNT_CACHE_SIZE: int = 1000
+    
+    # Maximum number of notes accepted by one bulk request
+    NOTES_BULK_MAX_ITEMS: int = int(os.environ.get("NOTES_BULK_MAX_ITEMS", "1000"))
+    
+    # Rows fetched per round trip from the server-side cursor behind note exports
+    NOTES_EXPORT_BATCH_SIZE: int = int(os.environ.get("NOTES_EXPORT_BATCH_SIZE", "500"))
+    
+    # Streaming imports insert and commit this many notes at a time. Longer
+    # lines are rejected, and at most NOTES_IMPORT_MAX_ERRORS line errors are
+    # echoed back, so an upload never has to fit in memory.
+    NOTES_IMPORT_CHUNK_SIZE: int = int(os.environ.get("NOTES_IMPORT_CHUNK_SIZE", "500"))
+    NOTES_IMPORT_MAX_LINE_BYTES: int = int(os.environ.get("NOTES_IMPORT_MAX_LINE_BYTES", str(1024 * 1024)))
+    NOTES_IMPORT_MAX_ERRORS: int = 100
+    
+    # Response cache for note list pages: "memory" (per process, LRU bounded
+    # by NOTES_LIST_CACHE_SIZE) or "redis" (shared, at NOTES_LIST_CACHE_URL).
+    # Entries are invalidated per owner on every note write; a TTL of 0 disables it.
+    NOTES_LIST_CACHE_BACKEND: str = os.environ.get("NOTES_LIST_CACHE_BACKEND", "memory")
+    NOTES_LIST_CACHE_URL: str = os.environ.get("NOTES_LIST_CACHE_URL", "redis://localhost:6379/0")
+    NOTES_LIST_CACHE_TTL_SECONDS: int = int(os.environ.get("NOTES_LIST_CACHE_TTL_SECONDS", "60"))
+    NOTES_LIST_CACHE_SIZE: int = int(os.environ.get("NOTES_LIST_CACHE_SIZE", "1000"))
+    
+    # Response compression, negotiated from Accept-Encoding in the order of
+    # COMPRESSION_ENCODINGS (br and zstd need the brotli and zstandard packages).
+    # Complete bodies below COMPRESSION_MINIMUM_SIZE bytes are sent as they are.
+    COMPRESSION_ENABLED: bool = os.environ.get("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_ENCODINGS: str = os.environ.get("COMPRESSION_ENCODINGS", "zstd,br,gzip")
+    COMPRESSION_MINIMUM_SIZE: int = int(os.environ.get("COMPRESSION_MINIMUM_SIZE", "500"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.environ.get("COMPRESSION_ZSTD_LEVEL", "3"))
+    
+    # Request metrics served at /metrics. Pool and threadpool gauges are
+    # sampled at most once per METRICS_GAUGE_INTERVAL_SECONDS per worker.
+    METRICS_ENABLED: bool = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_GAUGE_INTERVAL_SECONDS: float = float(os.environ.get("METRICS_GAUGE_INTERVAL_SECONDS", "1"))
+    
+    # Per-request SQL stats, sent as a Server-Timing header and appended to
+    # the access log. A statement run more than QUERY_REPEAT_THRESHOLD times in
+    # one request (an N+1 pattern) is logged, and fails the request when
+    # QUERY_REPEAT_FAIL is on (the default under TESTING). 0 disables the check.
+    QUERY_STATS_ENABLED: bool = os.environ.get("QUERY_STATS_ENABLED", "true").lower() == "true"
+    QUERY_REPEAT_THRESHOLD: int = int(os.environ.get("QUERY_REPEAT_THRESHOLD", "10"))
+    QUERY_REPEAT_FAIL: bool = os.environ.get(
+        "QUERY_REPEAT_FAIL", os.environ.get("TESTING", "false")
+    ).lower() == "true"
+    
+    # Authenticated-principal cache (per process); 0 disables caching.
+    # Demotions and deactivations reach other tasks through the token version
+    # sync (TOKEN_DENYLIST_SYNC_SECONDS); the TTL bounds other stale fields.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.environ.get("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+    PRINCIPAL_CACHE_SIZE: int = int(os.environ.get("PRINCIPAL_CACHE_SIZE", "10000"))
+    
     # JWT settings
     SECRET_KEY: str = os.environ.get("SECRET_KEY", "your-secret-key-for-jwt")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+    
+    # Stateless auth trusts the token claims instead of loading the user.
+    # Revoked token versions are tracked in memory and re-synced from the
+    # users table every TOKEN_DENYLIST_SYNC_SECONDS.
+    STATELESS_AUTH: bool = os.environ.get("STATELESS_AUTH", "false").lower() == "true"
+    TOKEN_DENYLIST_SYNC_SECONDS: int = int(os.environ.get("TOKEN_DENYLIST_SYNC_SECONDS", "10"))
+    
+    # Password hashing pool. bcrypt runs in this many worker processes and at
+    # most PASSWORD_HASH_MAX_PENDING hashes may wait; the rest get a 503.
+    PASSWORD_HASH_WORKERS: int = int(os.environ.get("PASSWORD_HASH_WORKERS", "1"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", "8"))
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
     
     # CORS settings
     ALLOWED_ORIGINS: List[str] = ["*"]  # Allow any origin including localhost with any port
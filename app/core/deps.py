@@ -1,21 +1,159 @@
-from typing import Optional
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_async_read_db
 from app.models.user import User, UserRole
 from app.schemas.user import TokenPayload
+from app.utils.cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+@dataclass(frozen=True)
+class Principal:
+    """
+    Immutable snapshot of the authenticated user, safe to share across requests.
+
+    In stateless mode the principal is built from token claims only, so the
+    profile fields (email, name, timestamps) are None.
+    """
+    id: int
+    role: UserRole
+    is_active: bool
+    token_version: int = 0
+    email: Optional[str] = None
+    name: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            role=user.role,
+            is_active=user.is_active,
+            token_version=user.token_version or 0,
+            email=user.email,
+            name=user.name,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+class TokenDenylist:
+    """
+    Minimum valid token version for users whose tokens were revoked.
+
+    Entries are kept only as long as a token issued before the revocation
+    could still be unexpired, so the map stays small.
+    """
+
+    def __init__(self) -> None:
+        self._min_versions: Dict[int, Tuple[int, float]] = {}
+        self._synced_at: Optional[datetime] = None
+        self._next_sync = 0.0
+
+    def revoke(self, user_id: int, min_version: int) -> None:
+        """
+        Reject tokens for `user_id` with a version below `min_version`
+        """
+        entry = self._min_versions.get(user_id)
+        if entry is None or entry[0] < min_version:
+            self._min_versions[user_id] = (min_version, time.monotonic())
+
+    def is_revoked(self, user_id: int, version: int) -> bool:
+        """
+        Check whether a token version has been revoked for `user_id`
+        """
+        entry = self._min_versions.get(user_id)
+        return entry is not None and version < entry[0]
+
+    async def maybe_sync(self, db: AsyncSession) -> None:
+        """
+        Pull revocations made by other processes, at most once per sync interval
+        """
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + settings.TOKEN_DENYLIST_SYNC_SECONDS
+        
+        token_lifetime = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        if self._synced_at is None:
+            since = datetime.utcnow() - token_lifetime
+        else:
+            # Overlap the previous window to tolerate clock skew between tasks
+            since = self._synced_at - timedelta(seconds=2 * settings.TOKEN_DENYLIST_SYNC_SECONDS)
+        self._synced_at = datetime.utcnow()
+        
+        result = await db.execute(
+            select(User.id, User.token_version).where(
+                User.token_version > 0, User.updated_at >= since
+            )
+        )
+        for user_id, token_version in result:
+            self.revoke(user_id, token_version)
+        
+        # Forget revocations whose tokens have all expired
+        cutoff = now - token_lifetime.total_seconds()
+        self._min_versions = {
+            user_id: entry for user_id, entry in self._min_versions.items() if entry[1] >= cutoff
+        }
+
+    def clear(self) -> None:
+        """
+        Drop every entry and force a full sync on the next check
+        """
+        self._min_versions.clear()
+        self._synced_at = None
+        self._next_sync = 0.0
+
+
+# Principals keyed by user id, so authenticated requests skip the users lookup
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+# Revoked token versions, consulted by stateless auth
+token_denylist = TokenDenylist()
+
+
+def revoke_tokens(user: User) -> None:
+    """
+    Revoke every token issued to `user` so far.
+
+    Commit the change and then call `remember_principal` to publish it.
+    """
+    user.token_version = (user.token_version or 0) + 1
+
+
+def remember_principal(user: User) -> Principal:
+    """
+    Cache the principal for `user` unless a newer snapshot is already cached.
+
+    Call this after committing a change to a user so that deactivation, role
+    changes and token revocation take effect immediately instead of waiting for the TTL.
+    """
+    principal = Principal.from_user(user)
+    cached: Optional[Principal] = principal_cache.get(principal.id)
+    if cached is None or cached.updated_at <= principal.updated_at:
+        principal_cache.set(principal.id, principal)
+    if principal.token_version:
+        token_denylist.revoke(principal.id, principal.token_version)
+    return principal
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_read_db), token: str = Depends(oauth2_scheme)
+) -> Principal:
     """
     Get the current user from the token
     """
@@ -38,16 +176,41 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == int(token_data.sub)).first()
-    if user is None or not user.is_active:
+    if settings.STATELESS_AUTH:
+        # Trust the signed claims; only the revocation list is consulted
+        await token_denylist.maybe_sync(db)
+        if token_denylist.is_revoked(int(token_data.sub), token_data.ver):
+            raise credentials_exception
+        return Principal(
+            id=int(token_data.sub),
+            role=UserRole(token_data.role),
+            is_active=True,
+            token_version=token_data.ver,
+        )
+    
+    principal: Optional[Principal] = principal_cache.get(int(token_data.sub))
+    if principal is not None:
+        # The cache is per process: demotions and deactivations made through
+        # another worker reach this one as token_version bumps in the synced list
+        await token_denylist.maybe_sync(db)
+        if token_denylist.is_revoked(principal.id, principal.token_version):
+            principal = None
+    if principal is None:
+        result = await db.execute(select(User).where(User.id == int(token_data.sub)))
+        user = result.scalar_one_or_none()
+        if user is None:
+            raise credentials_exception
+        principal = remember_principal(user)
+    
+    if not principal.is_active or token_data.ver < principal.token_version:
         raise credentials_exception
     
-    return user
+    return principal
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+async def get_current_active_user(
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """
     Get the current active user
     """
@@ -56,9 +219,9 @@ def get_current_active_user(
     return current_user
 
 
-def get_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+async def get_admin_user(
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """
     Get the current admin user
     """
@@ -67,4 +230,4 @@ def get_admin_user(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="Permission denied. Admin access required."
         )
-    return current_user
\ No newline at end of file
+    return current_user
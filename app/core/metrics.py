@@ -0,0 +1,161 @@
+import os
+import time
+
+from anyio import to_thread
+from fastapi.responses import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.core.config import settings
+from app.db.pool import pool_status
+from app.db.session import async_reader_engine, async_writer_engine
+
+# Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+# (set by run.py) and /metrics merges them, so any worker can answer a scrape
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Label for requests that matched no route, so unknown paths can't add series
+UNMATCHED_ROUTE = "unmatched"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "HTTP requests handled",
+    ["method", "route", "status"],
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled",
+    multiprocess_mode="livesum",
+)
+db_pool_connections = Gauge(
+    "db_pool_connections",
+    "Connections of the database pool by state",
+    ["engine", "state"],
+    multiprocess_mode="livesum",
+)
+db_pool_saturation = Gauge(
+    "db_pool_saturation",
+    "Checked-out share of the database pool's capacity (busiest worker)",
+    ["engine"],
+    multiprocess_mode="livemax",
+)
+threadpool_threads = Gauge(
+    "threadpool_threads",
+    "Worker threads of the sync threadpool by state",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+threadpool_saturation = Gauge(
+    "threadpool_saturation",
+    "Busy share of the sync threadpool (busiest worker)",
+    multiprocess_mode="livemax",
+)
+
+password_hashes_pending = Gauge(
+    "password_hashes_pending",
+    "Password hashes queued or running in the hash pool",
+    multiprocess_mode="livesum",
+)
+password_hash_duration_seconds = Histogram(
+    "password_hash_duration_seconds",
+    "Time a hash worker spent on one bcrypt hash or verification",
+    buckets=HASH_BUCKETS,
+)
+password_hash_wait_seconds = Histogram(
+    "password_hash_wait_seconds",
+    "Time a hash waited in the pool's queue before a worker ran it",
+    buckets=HASH_BUCKETS,
+)
+password_hash_rejections_total = Counter(
+    "password_hash_rejections_total",
+    "Password operations rejected because the hash pool was full",
+)
+
+# (counter, histogram) children per label tuple, skipping the labels() lookup
+_request_series = {}
+
+
+def observe_request(method: str, route: str, status: str, seconds: float) -> None:
+    """
+    Count one finished request and record its latency
+    """
+    key = (method, route, status)
+    series = _request_series.get(key)
+    if series is None:
+        series = _request_series[key] = (
+            http_requests_total.labels(*key),
+            http_request_duration_seconds.labels(*key),
+        )
+    series[0].inc()
+    series[1].observe(seconds)
+
+
+ENGINES = {"writer": async_writer_engine.sync_engine, "reader": async_reader_engine.sync_engine}
+
+_gauges_refreshed_at = 0.0
+
+
+def refresh_gauges(force: bool = False) -> None:
+    """
+    Sample pool and threadpool occupancy into their gauges.
+
+    Called after requests, but samples at most every METRICS_GAUGE_INTERVAL_SECONDS
+    so the hot path only pays for a clock read. Must run on the event loop.
+    """
+    global _gauges_refreshed_at
+    now = time.monotonic()
+    if not force and now - _gauges_refreshed_at < settings.METRICS_GAUGE_INTERVAL_SECONDS:
+        return
+    _gauges_refreshed_at = now
+
+    for name, engine in ENGINES.items():
+        status = pool_status(engine)
+        if status is None:
+            continue
+        for state in ("checked_out", "size", "overflow", "capacity"):
+            db_pool_connections.labels(name, state).set(status[state])
+        db_pool_saturation.labels(name).set(status["saturation"])
+
+    limiter = to_thread.current_default_thread_limiter()
+    busy, total = limiter.borrowed_tokens, limiter.total_tokens
+    threadpool_threads.labels("busy").set(busy)
+    threadpool_threads.labels("total").set(total)
+    threadpool_saturation.set(busy / total if total else 0.0)
+
+
+def metrics_response() -> Response:
+    """
+    All metrics in the Prometheus text exposition format
+    """
+    refresh_gauges(force=True)
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        body = generate_latest(registry)
+    else:
+        body = generate_latest()
+    return Response(body, media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead(pid: int) -> None:
+    """
+    Drop the live gauges of a worker that exited (gunicorn child_exit hook)
+    """
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,214 @@
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.query_stats import QueryStats, RepeatedQueryError, current_query_stats
+from app.db.session import SAFE_METHODS
+from app.utils.compression import compress, compressor, is_compressible, negotiate_encoding
+from app.utils.etag import encoded_etag
+
+
+class ReadYourWritesMiddleware:
+    """
+    Mark clients that just wrote so their next reads stick to the writer.
+
+    Successful unsafe requests get the write time (epoch seconds) back as a
+    cookie and as a response header; `get_read_db` honors either one.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or settings.READ_YOUR_WRITES_SECONDS <= 0
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                marker = f"{time.time():.3f}"
+                headers = MutableHeaders(scope=message)
+                headers.append(settings.READ_YOUR_WRITES_HEADER, marker)
+                headers.append(
+                    "Set-Cookie",
+                    f"{settings.READ_YOUR_WRITES_COOKIE}={marker}; "
+                    f"Max-Age={settings.READ_YOUR_WRITES_SECONDS}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class CompressionMiddleware:
+    """
+    Compress text-like responses with the best encoding the client accepts.
+
+    Complete bodies under COMPRESSION_MINIMUM_SIZE are sent as they are.
+    Streamed bodies are compressed chunk by chunk and flushed, so clients can
+    decode each chunk as it arrives. Responses that already carry a
+    Content-Encoding, such as precompressed cache entries, pass through.
+
+    Every negotiable response, compressed or not, gets `Vary: Accept-Encoding`,
+    and a compressed one gets its own ETag (`"<tag>-gzip"`), since its bytes
+    differ from the identity body's.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"))
+        start_message = None
+        passthrough = False
+        stream = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough, stream
+            
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if message["status"] == 304:
+                    # Echo the encoded ETag the client revalidated with
+                    headers.add_vary_header("Accept-Encoding")
+                    if encoding is not None and "etag" in headers:
+                        etag = encoded_etag(headers["etag"], encoding)
+                        if etag in request_headers.get("if-none-match", ""):
+                            headers["ETag"] = etag
+                    passthrough = True
+                    await send(message)
+                elif "content-encoding" in headers or not is_compressible(headers.get("content-type")):
+                    passthrough = True
+                    await send(message)
+                elif encoding is None:
+                    headers.add_vary_header("Accept-Encoding")
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Hold the headers until the first body chunk shows whether to compress
+                    start_message = message
+                return
+            
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is None:
+                headers = MutableHeaders(scope=start_message)
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body:
+                    if len(body) >= settings.COMPRESSION_MINIMUM_SIZE:
+                        body = compress(body, encoding)
+                        headers["Content-Encoding"] = encoding
+                        headers["Content-Length"] = str(len(body))
+                        if "etag" in headers:
+                            headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    passthrough = True
+                    return
+                
+                stream = compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                if "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                await send(start_message)
+            
+            chunk = stream.compress(body) if body else b""
+            if not more_body:
+                chunk += stream.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class MetricsMiddleware:
+    """
+    Count and time requests by method, route template and status.
+
+    The route label is the matched template (e.g. `/api/v1/notes/{note_id}`),
+    read from the scope after routing, so raw paths never become series.
+    Exceptions are recorded as 500s. Pool and threadpool gauges are sampled
+    on the way out, at most once per METRICS_GAUGE_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.http_requests_in_flight.dec()
+            route = getattr(scope.get("route"), "path_format", None) or metrics.UNMATCHED_ROUTE
+            metrics.observe_request(scope["method"], route, str(status_code), elapsed)
+            metrics.refresh_gauges()
+
+
+class QueryStatsMiddleware:
+    """
+    Collect the SQL statements each request runs.
+
+    The count and DB time so far go out in a Server-Timing header and in the
+    access log line, both written when the response starts; queries a
+    streamed body runs later are not included. With QUERY_REPEAT_FAIL on, a
+    request that repeated a statement past QUERY_REPEAT_THRESHOLD raises
+    RepeatedQueryError once it has finished.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        token = current_query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+
+        if stats.repeated and settings.QUERY_REPEAT_FAIL:
+            raise RepeatedQueryError(
+                f"{scope['method']} {scope['path']} repeated {len(stats.repeated)} statement(s) "
+                f"more than {settings.QUERY_REPEAT_THRESHOLD} times: {stats.repeated[0]}"
+            )
@@ -0,0 +1,113 @@
+import copy
+import math
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from uvicorn.config import LOGGING_CONFIG
+
+from app.core.config import settings
+
+APP = "app.main:app"
+
+
+def cgroup_cpu_quota(root: str = "/sys/fs/cgroup") -> Optional[float]:
+    """
+    CPUs granted by the container's cgroup quota, or None when unlimited.
+
+    Reads cgroup v2 `cpu.max`, falling back to the v1 CFS quota files.
+    """
+    base = Path(root)
+    try:
+        quota, _, period = (base / "cpu.max").read_text().strip().partition(" ")
+        if quota == "max":
+            return None
+        return int(quota) / int(period or 100000)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int((base / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((base / "cpu" / "cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        return None
+    if quota <= 0 or period <= 0:
+        return None
+    return quota / period
+
+
+def available_cpus(root: str = "/sys/fs/cgroup") -> int:
+    """
+    Whole CPUs this process may use: its affinity mask, capped by the cgroup quota
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = cgroup_cpu_quota(root)
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    """
+    Worker processes to run: WEB_CONCURRENCY, or one per available CPU
+    """
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    return available_cpus()
+
+
+def log_config() -> Dict[str, Any]:
+    """
+    uvicorn's logging setup with each request's query count and DB time
+    (set by QueryStatsFilter) at the end of access lines
+    """
+    config = copy.deepcopy(LOGGING_CONFIG)
+    config["formatters"]["access"]["fmt"] += " %(db_timing)s"
+    return config
+
+
+def prepare_metrics_dir() -> str:
+    """
+    Point PROMETHEUS_MULTIPROC_DIR at an empty directory so workers can share
+    metrics; must run before the app is imported
+    """
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        path = tempfile.mkdtemp(prefix="notes-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    for stale in Path(path).glob("*.db"):
+        stale.unlink()
+    return path
+
+
+def child_exit(server, worker) -> None:
+    """
+    Gunicorn hook: forget the live gauges of an exited worker
+    """
+    from app.core.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
+
+
+def gunicorn_options() -> Dict[str, Any]:
+    """
+    Gunicorn settings for the production server.
+
+    The app is imported once in the master and forked into uvicorn workers,
+    which pick uvloop and httptools when they are installed.
+    """
+    return {
+        "bind": f"{settings.HOST}:{settings.PORT}",
+        "workers": worker_count(),
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        "backlog": settings.SERVER_BACKLOG,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "accesslog": "-",
+        "errorlog": "-",
+        "child_exit": child_exit,
+    }
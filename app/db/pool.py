@@ -0,0 +1,174 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """
+    Counters for one engine's connection pool.
+
+    Checkout waits cover the whole `pool.connect()`: queueing for a free
+    connection, opening a new one and any liveness ping. Churn is the number
+    of connections opened, closed and invalidated over the pool's lifetime.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.slow_checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.pings = 0
+        self.failed_pings = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        threshold = settings.DB_POOL_SLOW_CHECKOUT_MS
+        if threshold > 0 and seconds * 1000 >= threshold:
+            self.slow_checkouts += 1
+            logger.warning("Slow %s pool checkout: %.1f ms", self.name, seconds * 1000)
+
+
+class _TimedPoolMixin:
+    """
+    Times every checkout into `self.stats`; recreated pools keep the same stats
+    """
+
+    stats: PoolStats
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            logger.warning("%s pool exhausted: checkout timed out", self.stats.name)
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(role: str, is_async: bool) -> Dict[str, Any]:
+    """
+    create_engine arguments for the "writer" or "reader" engine, from settings.
+
+    Pre-ping is left off: `instrument_pool` pings only connections that sat
+    idle longer than DB_POOL_PING_IDLE_SECONDS.
+    """
+    prefix = f"DB_{role.upper()}_"
+    statement_timeout = getattr(settings, prefix + "STATEMENT_TIMEOUT_MS")
+    if is_async:
+        connect_args = {"server_settings": {"statement_timeout": str(statement_timeout)}}
+    else:
+        connect_args = {"options": f"-c statement_timeout={statement_timeout}"}
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": getattr(settings, prefix + "POOL_SIZE"),
+        "max_overflow": getattr(settings, prefix + "MAX_OVERFLOW"),
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_use_lifo": True,
+        "connect_args": connect_args if statement_timeout > 0 else {},
+    }
+
+
+def instrument_pool(engine: Engine, name: str) -> PoolStats:
+    """
+    Attach stats and idle-based liveness checks to a sync engine's pool
+    (pass `async_engine.sync_engine` for async engines).
+
+    A connection idle for at least DB_POOL_PING_IDLE_SECONDS is pinged on
+    checkout; if the ping fails the pool discards it and hands out a fresh one.
+    """
+    stats = PoolStats(name)
+    engine.pool.stats = stats
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats.connects += 1
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        idle_limit = settings.DB_POOL_PING_IDLE_SECONDS
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_limit:
+            return
+        stats.pings += 1
+        try:
+            alive = engine.dialect.do_ping(dbapi_connection)
+        except Exception:
+            alive = False
+        if not alive:
+            stats.failed_pings += 1
+            raise exc.DisconnectionError("Idle connection failed its liveness ping")
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "close")
+    def on_close(dbapi_connection, connection_record):
+        stats.closes += 1
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats.invalidations += 1
+
+    return stats
+
+
+def pool_status(engine: Engine) -> Optional[Dict[str, Any]]:
+    """
+    Point-in-time view of an instrumented pool: occupancy, saturation, waits and churn
+    """
+    pool = engine.pool
+    stats: Optional[PoolStats] = getattr(pool, "stats", None)
+    if stats is None:
+        return None
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    return {
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+        "checkouts": stats.checkouts,
+        "wait_ms_avg": round(stats.wait_seconds_total * 1000 / stats.checkouts, 3) if stats.checkouts else 0.0,
+        "wait_ms_max": round(stats.wait_seconds_max * 1000, 3),
+        "slow_checkouts": stats.slow_checkouts,
+        "timeouts": stats.timeouts,
+        "connects": stats.connects,
+        "closes": stats.closes,
+        "invalidations": stats.invalidations,
+        "pings": stats.pings,
+        "failed_pings": stats.failed_pings,
+    }
@@ -0,0 +1,123 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RepeatedQueryError(RuntimeError):
+    """
+    Raised at the end of a request that repeated a statement too often,
+    when QUERY_REPEAT_FAIL is on (test runs)
+    """
+
+
+class QueryStats:
+    """
+    Statements run while handling one request and the time spent in them.
+
+    Statements are grouped by their SQL text, which SQLAlchemy renders with
+    placeholders, so the same query for different ids has one shape.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Dict[str, int] = {}
+        self.repeated: List[str] = []
+        # Set by endpoints whose repeats scale with their input by design
+        self.repeats_allowed = False
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if self.repeats_allowed:
+            return
+        seen = self.shapes.get(statement, 0) + 1
+        self.shapes[statement] = seen
+        threshold = settings.QUERY_REPEAT_THRESHOLD
+        if seen == threshold + 1 and threshold > 0:
+            self.repeated.append(statement)
+            logger.warning(
+                "Statement ran more than %d times in one request (possible N+1): %s",
+                threshold,
+                " ".join(statement.split())[:200],
+            )
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing header value for the queries so far
+        """
+        return f'db;dur={self.milliseconds:.1f};desc="{self.count} queries"'
+
+
+# Stats of the request being handled; None outside requests (migrations, scripts)
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def allow_repeated_queries() -> None:
+    """
+    Opt the current request out of the N+1 check, for endpoints that run the
+    same statements once per chunk of a batch (e.g. streaming imports)
+    """
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.repeats_allowed = True
+
+
+def instrument_queries() -> None:
+    """
+    Time every statement on every engine into the current request's QueryStats.
+
+    Listens on the Engine class, so it also covers engines created later,
+    such as the test database's. An executemany counts as one statement.
+    """
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_query_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    started = conn.info.get("query_started_at")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(exception_context):
+    started = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+class QueryStatsFilter(logging.Filter):
+    """
+    Adds the request's query count and DB time to uvicorn access log records,
+    both to the message and as `db_timing` for formatters that name fields
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        stats = current_query_stats.get()
+        if stats is None:
+            record.db_timing = ""
+        else:
+            record.db_timing = f"{stats.count} queries {stats.milliseconds:.1f}ms"
+            record.msg = f"{record.msg} - {record.db_timing}"
+        return True
@@ -1,15 +1,22 @@
+import time
+
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.pool import engine_options, instrument_pool
+from app.db.query_stats import instrument_queries
 
 # Create SQLAlchemy engines
+# The sync engines serve migrations and maintenance scripts; the API uses the async ones below
 # Writer engine (for write operations)
-writer_engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
+writer_engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, **engine_options("writer", is_async=False))
 
 # Reader engine (for read-only operations)
-reader_engine = create_engine(settings.SQLALCHEMY_READER_URI, pool_pre_ping=True)
+reader_engine = create_engine(settings.SQLALCHEMY_READER_URI, **engine_options("reader", is_async=False))
 
 # Create SessionLocal classes for database sessions
 # For write operations
@@ -17,6 +24,31 @@ WriterSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=writer
 # For read operations
 ReaderSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=reader_engine)
 
+# Async engines (asyncpg) so request handlers wait on Postgres without holding a thread
+async_writer_engine = create_async_engine(
+    settings.ASYNC_SQLALCHEMY_DATABASE_URI, **engine_options("writer", is_async=True)
+)
+async_reader_engine = create_async_engine(
+    settings.ASYNC_SQLALCHEMY_READER_URI, **engine_options("reader", is_async=True)
+)
+
+# Pool stats and idle-based liveness checks (these replace pool_pre_ping)
+instrument_pool(writer_engine, "writer_sync")
+instrument_pool(reader_engine, "reader_sync")
+instrument_pool(async_writer_engine.sync_engine, "writer")
+instrument_pool(async_reader_engine.sync_engine, "reader")
+
+# Per-request query counts and DB time (see QueryStatsMiddleware)
+instrument_queries()
+
+# Objects stay usable after commit so handlers can return them without a lazy reload
+AsyncWriterSessionLocal = async_sessionmaker(
+    bind=async_writer_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+AsyncReaderSessionLocal = async_sessionmaker(
+    bind=async_reader_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Create Base class for database models
 Base = declarative_base()
 
@@ -32,13 +64,74 @@ def get_db():
         db.close()
 
 
-def get_read_db():
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def read_from_writer(request: Request) -> bool:
+    """
+    Decide whether a read must go to the writer instead of the reader.
+
+    Unsafe requests always use the writer. Safe requests stick to the writer
+    while the client's last write (cookie or header, epoch seconds) is within
+    READ_YOUR_WRITES_SECONDS, so replica lag never shows stale data.
+    """
+    if request.method not in SAFE_METHODS:
+        return True
+    
+    window = settings.READ_YOUR_WRITES_SECONDS
+    if window <= 0:
+        return False
+    
+    marker = request.headers.get(settings.READ_YOUR_WRITES_HEADER) or request.cookies.get(
+        settings.READ_YOUR_WRITES_COOKIE
+    )
+    if not marker:
+        return False
+    
+    try:
+        last_write = float(marker)
+    except ValueError:
+        return False
+    
+    return time.time() - last_write < window
+
+
+def get_read_db(request: Request):
     """
     Dependency to get a read-only database session (reader endpoint)
-    When using Aurora, this will connect to the reader endpoint for better read scalability
+    When using Aurora, this will connect to the reader endpoint for better read scalability.
+    Falls back to the writer for unsafe requests and recent writers (read-your-writes).
     """
-    db = ReaderSessionLocal()
+    session_factory = WriterSessionLocal if read_from_writer(request) else ReaderSessionLocal
+    db = session_factory()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """
+    Dependency to get an async database session for write operations (primary endpoint)
+    """
+    async with AsyncWriterSessionLocal() as db:
+        yield db
+
+
+def get_async_read_sessionmaker(request: Request) -> async_sessionmaker:
+    """
+    Dependency to get the async session factory for reads, routed like `get_read_db`.
+    Streaming responses outlive their dependencies, so they open sessions from this themselves.
+    """
+    return AsyncWriterSessionLocal if read_from_writer(request) else AsyncReaderSessionLocal
+
+
+async def get_async_read_db(
+    session_factory: async_sessionmaker = Depends(get_async_read_sessionmaker)
+):
+    """
+    Dependency to get an async read-only database session (reader endpoint)
+    Follows the same read-your-writes routing as `get_read_db`.
+    """
+    async with session_factory() as db:
+        yield db
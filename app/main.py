@@ -1,8 +1,34 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api.endpoints import auth, notes, users
 from app.core.config import settings
+from app.core.metrics import metrics_response
+from app.core.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    ReadYourWritesMiddleware,
+)
+from app.db.pool import pool_status
+from app.db.query_stats import QueryStatsFilter
+from app.db.session import async_reader_engine, async_writer_engine
+from app.utils.auth import HashPoolBusy, hash_pool
+from app.utils.search import check_search_support
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    for engine in (async_writer_engine, async_reader_engine):
+        check_search_support(engine.dialect.name)
+    yield
+    hash_pool.shutdown()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -41,6 +67,7 @@ app = FastAPI(
     license_info={
         "name": "MIT License",
     },
+    lifespan=lifespan,
 )
 
 # Set up CORS
@@ -50,9 +77,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[settings.READ_YOUR_WRITES_HEADER, "ETag", "Last-Modified"],
     allow_origin_regex="https?://.*" if "*" in settings.ALLOWED_ORIGINS else None,
 )
 
+# Route reads of recent writers to the writer instance
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Compress responses the client can decode (outside the app, so it sees final bodies)
+app.add_middleware(CompressionMiddleware)
+
+# Count and time each request's SQL statements; the filter adds them to
+# access log lines (and leaves them blank when stats are off)
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+logging.getLogger("uvicorn.access").addFilter(QueryStatsFilter())
+
+# Count and time requests (outermost, so latency includes compression)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(HashPoolBusy)
+async def hash_pool_busy_handler(request: Request, exc: HashPoolBusy):
+    """Shed password operations beyond the hash pool's capacity"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many concurrent password operations, retry later"},
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
 # Include API routers
 app.include_router(auth.router, tags=["auth"])
 app.include_router(notes.router, tags=["notes"])
@@ -60,18 +114,33 @@ app.include_router(users.router, tags=["admin", "users"])
 
 
 @app.get("/", tags=["health"])
-def root():
+async def root():
     """Root endpoint"""
     return {"status": "ok", "message": "Notes API is running"}
 
 
 @app.get("/health", tags=["health"])
-def health_check():
+async def health_check():
     """Health check endpoint for load balancers and container health checks"""
     return {"status": "ok", "service": "notes-backend"}
 
 
 @app.get("/api/health", tags=["health"])
-def api_health_check():
+async def api_health_check():
     """API health check endpoint for ECS container health checks"""
-    return {"status": "ok", "service": "notes-backend-api"}
\ No newline at end of file
+    return {"status": "ok", "service": "notes-backend-api"}
+
+
+@app.get("/health/db-pool", tags=["health"])
+async def db_pool_health():
+    """Connection pool occupancy, checkout waits and churn for each database engine"""
+    return {
+        "writer": pool_status(async_writer_engine.sync_engine),
+        "reader": pool_status(async_reader_engine.sync_engine),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics in the text exposition format"""
+    return metrics_response()
@@ -1,2 +1,4 @@
 from app.models.user import User, UserRole
 from app.models.note import Note
+from app.models.refresh_token import RefreshToken
+from app.models.note_import import NoteImport
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DDL, Column, DateTime, ForeignKey, Index, Integer, String, Text, event
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -17,4 +17,54 @@ class Note(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship with User
-    owner = relationship("User", back_populates="notes")
\ No newline at end of file
+    owner = relationship("User", back_populates="notes")
+
+    # Listing indexes matching the (created_at DESC, id DESC) keyset order
+    __table_args__ = (
+        Index("ix_notes_owner_id_created_at_id", owner_id, created_at.desc(), id.desc()),
+        Index("ix_notes_created_at_id", created_at, id),
+        # Serves max(updated_at) per owner for list ETags
+        Index("ix_notes_owner_id_updated_at", owner_id, updated_at),
+        # Serves max(updated_at) across owners for the admin list ETag
+        Index("ix_notes_updated_at", updated_at),
+    )
+
+# Full-text search support lives outside the mapped columns because it is
+# dialect specific. Postgres keeps a GIN index on the tsvector expression, which
+# search queries repeat verbatim; SQLite keeps an FTS5 index synced by triggers.
+NOTES_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+event.listen(
+    Note.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_notes_search_vector ON notes "
+        f"USING gin (({NOTES_SEARCH_VECTOR_SQL}))"
+    ).execute_if(dialect="postgresql"),
+)
+
+for statement in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5("
+    "title, description, content='notes', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS notes_fts_ai AFTER INSERT ON notes BEGIN "
+    "INSERT INTO notes_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS notes_fts_ad AFTER DELETE ON notes BEGIN "
+    "INSERT INTO notes_fts(notes_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS notes_fts_au AFTER UPDATE ON notes BEGIN "
+    "INSERT INTO notes_fts(notes_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO notes_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+):
+    event.listen(Note.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    Note.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS notes_fts").execute_if(dialect="sqlite"),
+)
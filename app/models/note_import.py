@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from app.db.session import Base
+
+
+class NoteImport(Base):
+    __tablename__ = "note_imports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Client-chosen key; re-sending an upload with the same key resumes it
+    key = Column(String(64), nullable=False)
+    # Input lines processed by committed chunks, advanced in the same
+    # transaction as the chunk's notes
+    committed_lines = Column(Integer, default=0, server_default="0", nullable=False)
+    created = Column(Integer, default=0, server_default="0", nullable=False)
+    error_count = Column(Integer, default=0, server_default="0", nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationship with User
+    owner = relationship("User")
+
+    __table_args__ = (
+        UniqueConstraint(owner_id, key, name="uq_note_imports_owner_id_key"),
+    )
@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum as PyEnum
 from typing import List, Optional
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Enum, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -22,6 +22,11 @@ class User(Base):
     hashed_password = Column(String(100), nullable=False)
     role = Column(Enum(UserRole), default=UserRole.USER, nullable=False)
     is_active = Column(Boolean, default=True)
+    # Bumped on logout, deactivation and role changes to revoke issued tokens
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
+    # Denormalized note counters, maintained by every note write path
+    note_count = Column(Integer, default=0, server_default="0", nullable=False)
+    note_bytes = Column(BigInteger, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -1,2 +1,6 @@
-from app.schemas.user import UserBase, UserCreate, UserLogin, UserResponse, Token, TokenPayload
-from app.schemas.note import NoteBase, NoteCreate, NoteUpdate, NoteResponse
+from app.schemas.user import UserBase, UserCreate, UserLogin, UserResponse, Token, TokenPayload, RefreshTokenRequest
+from app.schemas.note import (
+    NoteBase, NoteCreate, NoteUpdate, NoteResponse, NoteBulkCreate, NoteBulkError, NoteBulkCreateResponse,
+    NoteBulkSelector, NoteBulkUpdate, NoteBulkResult, ExportFormat,
+    NoteImportLineError, NoteImportProgress, NoteImportResult
+)
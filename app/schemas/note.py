@@ -1,7 +1,12 @@
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+from typing_extensions import TypedDict
+
+from app.core.config import settings
+from app.schemas.user import PaginationMeta
 
 
 class NoteBase(BaseModel):
@@ -23,4 +28,131 @@ class NoteResponse(NoteBase):
     created_at: datetime = Field(..., description="When the note was created")
     updated_at: datetime = Field(..., description="When the note was last updated")
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NoteSparseResponse(BaseModel):
+    """
+    A listed note trimmed to a `fields` sparse fieldset. Each field is only
+    present when requested; defaults of None just mark them as optional.
+    """
+    title: str = Field(None, description="Title of the note")
+    description: Optional[str] = Field(None, description="Content of the note")
+    id: int = Field(None, description="Unique note identifier")
+    owner_id: int = Field(None, description="ID of the user who owns this note")
+    created_at: datetime = Field(None, description="When the note was created")
+    updated_at: datetime = Field(None, description="When the note was last updated")
+
+
+class NoteRow(TypedDict):
+    """
+    NoteResponse as a plain dict, for serializing column rows without building models
+    """
+    title: str
+    description: Optional[str]
+    id: int
+    owner_id: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class NotePage(TypedDict):
+    """
+    PaginatedResponse[NoteResponse] as a plain dict
+    """
+    items: List[NoteRow]
+    meta: PaginationMeta
+
+
+class NoteBulkCreate(BaseModel):
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.NOTES_BULK_MAX_ITEMS,
+        description="Notes to create, each shaped like NoteCreate"
+    )
+    partial: bool = Field(
+        False, description="Create the valid items and report the invalid ones instead of rejecting the batch"
+    )
+
+
+class NoteBulkError(BaseModel):
+    index: int = Field(..., description="Position of the rejected item in the request")
+    errors: List[Dict[str, Any]] = Field(..., description="Validation errors for the item")
+
+
+class NoteBulkCreateResponse(BaseModel):
+    items: List[NoteResponse] = Field(..., description="Created notes, in request order")
+    errors: List[NoteBulkError] = Field([], description="Items that were not created")
+
+
+class NoteBulkSelector(BaseModel):
+    ids: Optional[List[int]] = Field(
+        None, min_length=1, max_length=settings.NOTES_BULK_MAX_ITEMS, description="IDs of the notes to change"
+    )
+    created_before: Optional[datetime] = Field(
+        None, description="Only change notes created before this time"
+    )
+
+    @field_validator("created_before")
+    @classmethod
+    def naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # created_at is stored as naive UTC; compare against the same
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @model_validator(mode="after")
+    def check_selector(self) -> "NoteBulkSelector":
+        if self.ids is None and self.created_before is None:
+            raise ValueError("Provide ids, created_before or both")
+        return self
+
+
+class NoteBulkUpdate(NoteBulkSelector):
+    title: Optional[str] = Field(None, min_length=1, max_length=200, description="New title for every selected note")
+    description: Optional[str] = Field(None, description="New content for every selected note")
+
+    @model_validator(mode="after")
+    def check_changes(self) -> "NoteBulkUpdate":
+        if self.title is None and self.description is None:
+            raise ValueError("Provide a title, a description or both")
+        return self
+
+
+class NoteBulkResult(BaseModel):
+    affected: List[int] = Field(..., description="IDs of the notes that were changed")
+    forbidden: List[int] = Field([], description="Requested IDs that belong to another user")
+    missing: List[int] = Field([], description="Requested IDs with no matching note")
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class NoteImportLineError(BaseModel):
+    line: int = Field(..., description="Line number of the rejected record, starting from 1")
+    errors: List[Dict[str, Any]] = Field(..., description="Parse or validation errors for the line")
+
+
+class NoteImportProgress(BaseModel):
+    key: str = Field(..., description="Import key chosen by the client")
+    committed_lines: int = Field(..., description="Input lines covered by committed chunks; a resumed upload skips these")
+    created: int = Field(..., description="Notes created so far")
+    error_count: int = Field(..., description="Lines rejected so far")
+    updated_at: datetime = Field(..., description="When the last chunk was committed")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NoteImportResult(BaseModel):
+    key: Optional[str] = Field(None, description="Import key, if the upload is resumable")
+    lines_read: int = Field(..., description="Input lines read by this request")
+    skipped_lines: int = Field(0, description="Lines skipped because an earlier upload already committed them")
+    committed_lines: int = Field(..., description="Input lines covered by committed chunks")
+    created: int = Field(..., description="Notes created by this request")
+    error_count: int = Field(0, description="Lines rejected by this request")
+    errors: List[NoteImportLineError] = Field(
+        [], description=f"The first {settings.NOTES_IMPORT_MAX_ERRORS} rejected lines"
+    )
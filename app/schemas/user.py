@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import Optional, List, Generic, TypeVar
 
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
@@ -25,6 +26,8 @@ class UserResponse(UserBase):
     role: str
     is_active: bool
     created_at: datetime
+    note_count: int = 0
+    note_bytes: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -46,19 +49,48 @@ class NoteInfo(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserNoteStats(BaseModel):
+    count: int = Field(..., description="Number of notes the user owns")
+    first_note_at: Optional[datetime] = Field(None, description="When the user's oldest note was created")
+    last_note_at: Optional[datetime] = Field(None, description="When the user's newest note was created")
+    last_activity_at: Optional[datetime] = Field(None, description="When any of the user's notes last changed")
+
+
 class UserDetailResponse(UserResponse):
     updated_at: datetime
-    notes: List[NoteInfo] = []
+    notes: List[NoteInfo] = Field([], description="The user's most recent notes, newest first")
+    notes_next_cursor: Optional[str] = Field(
+        None, description="Cursor for the user's next notes, or null if all are embedded"
+    )
+    notes_next: Optional[str] = Field(
+        None, description="Link to the next page of the user's notes, or null if all are embedded"
+    )
+    note_stats: UserNoteStats = Field(..., description="Aggregate statistics over all of the user's notes")
 
     model_config = ConfigDict(from_attributes=True)
 
 
 # Pagination schemas
+class TotalStrategy(str, Enum):
+    """How the total item count of a paginated response is computed"""
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+    NONE = "none"
+
+
 class PaginationMeta(BaseModel):
-    total: int = Field(..., description="Total number of items")
-    page: int = Field(..., description="Current page number")
+    total: Optional[int] = Field(None, description="Total number of items (null with the 'none' strategy)")
+    page: Optional[int] = Field(None, description="Current page number (not set in cursor mode)")
     size: int = Field(..., description="Page size")
-    pages: int = Field(..., description="Total number of pages")
+    pages: Optional[int] = Field(None, description="Total number of pages (null with the 'none' strategy)")
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page, or null on the last page"
+    )
+    has_more: bool = Field(False, description="Whether another page follows this one")
+    total_strategy: TotalStrategy = Field(
+        TotalStrategy.EXACT, description="Strategy used to compute `total`"
+    )
 
 
 T = TypeVar('T')
@@ -75,9 +107,15 @@ class PaginatedResponse(BaseModel, Generic[T]):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(..., description="Refresh token returned by login or refresh")
 
 
 class TokenPayload(BaseModel):
     sub: str  # User ID
     exp: int  # Expiration time
-    role: str  # User role
\ No newline at end of file
+    role: str  # User role
+    ver: int = 0  # Token version, compared against users.token_version
\ No newline at end of file
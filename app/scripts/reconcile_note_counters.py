@@ -0,0 +1,20 @@
+"""
+Rebuild users.note_count and users.note_bytes from the notes table.
+
+Usage: python -m app.scripts.reconcile_note_counters
+"""
+from app.db.session import WriterSessionLocal
+from app.utils.note_stats import reconcile_note_counters
+
+
+def main() -> None:
+    db = WriterSessionLocal()
+    try:
+        fixed = reconcile_note_counters(db)
+    finally:
+        db.close()
+    print(f"Reconciled note counters for {fixed} user(s)")
+
+
+if __name__ == "__main__":
+    main()
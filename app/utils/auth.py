@@ -1,9 +1,16 @@
+import asyncio
+import hashlib
+import multiprocessing
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core import metrics
 from app.core.config import settings
 
 # Password hashing context
@@ -24,8 +31,127 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _timed(func: Callable, *args: Any) -> Tuple[Any, float]:
+    """
+    Run `func` in a hash worker and report how long it took there
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class HashPoolBusy(Exception):
+    """
+    Raised when the password hash pool is at capacity
+    """
+
+
+class PasswordHashPool:
+    """
+    Bounded process pool for bcrypt work.
+
+    Hashing runs outside the event loop and outside the GIL. At most
+    `max_pending` hashes may be queued or running; further requests are
+    rejected with HashPoolBusy instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.wait_seconds_total = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created lazily so a pre-forking server never shares it between workers
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        """
+        Run `func(*args)` in the pool, or raise HashPoolBusy if it is full
+        """
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            metrics.password_hash_rejections_total.inc()
+            raise HashPoolBusy()
+        
+        self.pending += 1
+        metrics.password_hashes_pending.inc()
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, hash_seconds = await loop.run_in_executor(
+                self._get_executor(), _timed, func, *args
+            )
+        finally:
+            self.pending -= 1
+            metrics.password_hashes_pending.dec()
+        
+        wait_seconds = time.perf_counter() - start - hash_seconds
+        self.completed += 1
+        self.hash_seconds_total += hash_seconds
+        self.hash_seconds_max = max(self.hash_seconds_max, hash_seconds)
+        self.wait_seconds_total += wait_seconds
+        metrics.password_hash_duration_seconds.observe(hash_seconds)
+        metrics.password_hash_wait_seconds.observe(wait_seconds)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth and timing counters for monitoring
+        """
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "hash_seconds_total": self.hash_seconds_total,
+            "hash_seconds_max": self.hash_seconds_max,
+            "wait_seconds_total": self.wait_seconds_total,
+        }
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes; the pool restarts lazily on next use
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS, max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in the hash pool
+    """
+    return await hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password in the hash pool
+    """
+    return await hash_pool.run(get_password_hash, password)
+
+
 def create_access_token(
-    subject: Union[str, Any], role: str, expires_delta: Optional[timedelta] = None
+    subject: Union[str, Any],
+    role: str,
+    expires_delta: Optional[timedelta] = None,
+    token_version: int = 0,
 ) -> str:
     """
     Create a JWT token
@@ -37,8 +163,25 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode = {"exp": expire, "sub": str(subject), "role": role}
+    to_encode = {"exp": expire, "sub": str(subject), "role": role, "ver": token_version}
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+
+def create_refresh_token() -> Tuple[str, str]:
+    """
+    Create an opaque refresh token; returns (token, token_hash)
+    """
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Hash a refresh token for storage and lookup.
+
+    Refresh tokens are random, so a fast digest is enough - no bcrypt needed.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,142 @@
+import zlib
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+# Brotli and Zstandard are optional; without them only gzip is offered
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+
+
+class _GzipStream:
+    def __init__(self) -> None:
+        self._obj = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self) -> None:
+        self._obj = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdStream:
+    def __init__(self) -> None:
+        self._obj = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+_STREAMS = {"gzip": _GzipStream}
+if brotli is not None:
+    _STREAMS["br"] = _BrotliStream
+if zstandard is not None:
+    _STREAMS["zstd"] = _ZstdStream
+
+
+def available_encodings() -> List[str]:
+    """
+    Configured encodings that can be produced here, most preferred first
+    """
+    configured = (name.strip() for name in settings.COMPRESSION_ENCODINGS.split(","))
+    return [name for name in configured if name in _STREAMS]
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Map each coding in an Accept-Encoding header to its q-value
+    """
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the most preferred available encoding the client accepts, or None
+    """
+    if not settings.COMPRESSION_ENABLED or not accept_encoding:
+        return None
+    accepted = _parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    for encoding in available_encodings():
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """
+    Whether a media type is text-like enough to be worth compressing
+    """
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+    )
+
+
+def compressor(encoding: str):
+    """
+    Incremental compressor for `encoding`: `compress(chunk)` returns bytes the
+    client can decode right away, `finish()` ends the stream
+    """
+    return _STREAMS[encoding]()
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """
+    Compress a complete body with `encoding`
+    """
+    if encoding == "gzip":
+        obj = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+        return obj.compress(data) + obj.flush()
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Unsupported encoding: {encoding}")
@@ -0,0 +1,108 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the values a representation is derived from
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    ETag of the `encoding`-compressed form of a representation, e.g. `"<tag>-gzip"`
+    """
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _identity_etag(etag: str) -> str:
+    """
+    Undo `encoded_etag`, so validators match whichever encoding the client got
+    """
+    tag, dash, coding = etag[:-1].rpartition("-")
+    if dash and coding.isalpha() and etag.endswith('"'):
+        return f'{tag}"'
+    return etag
+
+
+def _etag_in(header: str, etag: str, weak: bool) -> bool:
+    """
+    Check whether `etag`, in any content coding, is listed in an If-Match /
+    If-None-Match header value
+    """
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if _identity_etag(candidate) == etag:
+            return True
+    return False
+
+
+def _as_utc(value: datetime) -> datetime:
+    """
+    Treat naive timestamps as UTC, as they are stored
+    """
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    Validator headers for a representation; clients must revalidate before reuse
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match, or If-Modified-Since when no ETag was sent.
+
+    Last-Modified has one-second resolution, so If-Modified-Since compares
+    whole seconds.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_in(if_none_match, etag, weak=True)
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """
+    Empty 304 carrying the current validators
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, last_modified)
+    )
+
+
+def check_if_match(request: Request, etag: str) -> None:
+    """
+    Raise 412 if the request's If-Match does not list the current ETag
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is not None and not _etag_in(if_match, etag, weak=False):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Precondition failed - the resource has changed"
+        )
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.sql import ColumnElement
+
+from app.core.config import settings
+from app.models.note import Note
+from app.schemas.note import ExportFormat
+
+# Exported fields, in NoteResponse order
+EXPORT_COLUMNS = ("id", "title", "description", "owner_id", "created_at", "updated_at")
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _ndjson_lines(rows) -> str:
+    """
+    Render rows as newline-delimited JSON objects
+    """
+    return "".join(
+        json.dumps(
+            {
+                **row._asdict(),
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+            },
+            ensure_ascii=False,
+        ) + "\n"
+        for row in rows
+    )
+
+
+def _csv_lines(rows, header: bool = False) -> str:
+    """
+    Render rows as CSV records, optionally preceded by the header
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in row
+        ])
+    return buffer.getvalue()
+
+
+async def stream_notes_export(
+    session_factory: async_sessionmaker,
+    criteria: List[ColumnElement],
+    export_format: ExportFormat,
+) -> AsyncIterator[str]:
+    """
+    Stream every note matching `criteria` as NDJSON or CSV, oldest first.
+
+    Rows come from a server-side cursor in batches of NOTES_EXPORT_BATCH_SIZE
+    and are rendered one batch at a time, so memory stays flat however many
+    notes match. Plain column rows skip the ORM identity map.
+    """
+    if export_format == ExportFormat.CSV:
+        yield _csv_lines([], header=True)
+
+    query = (
+        select(*(getattr(Note, name) for name in EXPORT_COLUMNS))
+        .where(*criteria)
+        .order_by(Note.created_at, Note.id)
+        .execution_options(yield_per=settings.NOTES_EXPORT_BATCH_SIZE)
+    )
+    async with session_factory() as db:
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            if export_format == ExportFormat.CSV:
+                yield _csv_lines(rows)
+            else:
+                yield _ndjson_lines(rows)
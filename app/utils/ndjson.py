@@ -0,0 +1,36 @@
+from typing import AsyncIterator, Tuple
+
+
+class LineTooLong(ValueError):
+    """
+    Raised when an NDJSON line exceeds the allowed size
+    """
+
+    def __init__(self, line: int) -> None:
+        super().__init__(f"Line {line} is too long")
+        self.line = line
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Split a byte stream into (line number, line) pairs, numbering from 1.
+
+    Only the current partial line is buffered. A line longer than
+    `max_line_bytes` raises LineTooLong as soon as it is seen.
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if len(line) > max_line_bytes:
+                raise LineTooLong(line_number)
+            yield line_number, line
+        if len(buffer) > max_line_bytes:
+            raise LineTooLong(line_number + 1)
+    if buffer:
+        yield line_number + 1, buffer
@@ -0,0 +1,96 @@
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import LargeBinary, case, cast, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+from app.models.note import Note
+from app.models.user import User
+
+
+def description_bytes(description: Optional[str]) -> int:
+    """
+    Size of a note description in bytes, as counted in users.note_bytes
+    """
+    return len(description.encode("utf-8")) if description else 0
+
+
+def description_bytes_expr(dialect_name: str) -> ColumnElement:
+    """
+    SQL expression for `description_bytes` on the given dialect.
+
+    Postgres counts the text's bytes with octet_length; casting text to bytea
+    would parse backslashes as escapes. SQLite measures it as a BLOB.
+    """
+    if dialect_name == "postgresql":
+        return func.coalesce(func.octet_length(Note.description), 0)
+    return func.coalesce(func.length(cast(Note.description, LargeBinary)), 0)
+
+
+async def adjust_note_counters(
+    db: AsyncSession, owner_id: int, count_delta: int, bytes_delta: int
+) -> None:
+    """
+    Apply a delta to a user's note counters in the current transaction
+    """
+    if not count_delta and not bytes_delta:
+        return
+    await db.execute(
+        update(User)
+        .where(User.id == owner_id)
+        .values(
+            note_count=User.note_count + count_delta,
+            note_bytes=User.note_bytes + bytes_delta,
+            # Counter upkeep is not a profile change
+            updated_at=User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def adjust_note_counters_many(
+    db: AsyncSession, deltas: Dict[int, Tuple[int, int]]
+) -> None:
+    """
+    Apply (count, bytes) deltas to many users' note counters with one UPDATE
+    """
+    deltas = {owner_id: delta for owner_id, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+    count_deltas = {owner_id: count for owner_id, (count, _) in deltas.items()}
+    bytes_deltas = {owner_id: size for owner_id, (_, size) in deltas.items()}
+    await db.execute(
+        update(User)
+        .where(User.id.in_(deltas))
+        .values(
+            note_count=User.note_count + case(count_deltas, value=User.id, else_=0),
+            note_bytes=User.note_bytes + case(bytes_deltas, value=User.id, else_=0),
+            updated_at=User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reconcile_note_counters(db: Session) -> int:
+    """
+    Rebuild every user's note counters from a scan of the notes table.
+
+    Returns the number of users whose counters had drifted.
+    """
+    actual_count = (
+        select(func.count()).where(Note.owner_id == User.id).scalar_subquery()
+    )
+    actual_bytes = (
+        select(func.coalesce(func.sum(description_bytes_expr(db.get_bind().dialect.name)), 0))
+        .where(Note.owner_id == User.id)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(User)
+        .where((User.note_count != actual_count) | (User.note_bytes != actual_bytes))
+        .values(note_count=actual_count, note_bytes=actual_bytes, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
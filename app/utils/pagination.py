@@ -0,0 +1,98 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.schemas.user import TotalStrategy
+from app.utils.cache import TTLCache
+
+# Memoized counts per (statement, parameters) for the 'cached' strategy
+count_cache = TTLCache(
+    maxsize=settings.PAGINATION_COUNT_CACHE_SIZE, ttl=settings.PAGINATION_COUNT_CACHE_SECONDS
+)
+
+
+def encode_cursor(created_at: datetime, note_id: int) -> str:
+    """
+    Encode a (created_at, id) keyset position as an opaque cursor string
+    """
+    raw = f"{created_at.isoformat()}|{note_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises ValueError if the cursor is malformed. A timestamp with a UTC
+    offset is converted to naive UTC, as created_at is stored.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, note_id = raw.rsplit("|", 1)
+        created_at = datetime.fromisoformat(created_at)
+        note_id = int(note_id)
+    except (UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return created_at, note_id
+
+
+async def _estimate_rows(db: AsyncSession, count_stmt: Select) -> Optional[int]:
+    """
+    Ask the Postgres planner how many rows the filter of `count_stmt` matches
+    """
+    rows_stmt = count_stmt.with_only_columns(literal_column("1"))
+    connection = await db.connection()
+    try:
+        sql = str(rows_stmt.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        ))
+    except Exception:
+        # Some parameter types cannot be rendered inline; count exactly instead
+        return None
+    
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_total(
+    db: AsyncSession, count_stmt: Select, strategy: Optional[TotalStrategy] = None
+) -> Tuple[Optional[int], TotalStrategy]:
+    """
+    Compute the total for a paginated listing.
+
+    `count_stmt` must be a `SELECT count(*) FROM ... WHERE ...` statement.
+    Returns the total and the strategy actually used: 'estimated' falls back
+    to 'exact' on databases without planner statistics.
+    """
+    strategy = strategy or TotalStrategy(settings.PAGINATION_TOTAL_STRATEGY)
+    
+    if strategy == TotalStrategy.NONE:
+        return None, strategy
+    
+    if strategy == TotalStrategy.CACHED:
+        compiled = count_stmt.compile()
+        key = (str(compiled), tuple(compiled.params.items()))
+        total = count_cache.get(key)
+        if total is None:
+            total = await db.scalar(count_stmt)
+            count_cache.set(key, total)
+        return total, strategy
+    
+    if strategy == TotalStrategy.ESTIMATED and db.get_bind().dialect.name == "postgresql":
+        total = await _estimate_rows(db, count_stmt)
+        if total is not None:
+            return total, strategy
+    
+    return await db.scalar(count_stmt), TotalStrategy.EXACT
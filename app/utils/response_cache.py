@@ -0,0 +1,211 @@
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Generation key of the admin scope, which lists every owner's notes
+ALL_SCOPE = "all"
+
+
+class CacheBackend(ABC):
+    """
+    Storage behind a ResponseCache: expiring entries plus counters that never expire
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def get_counter(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process backend: a size-bounded LRU of entries and of counters.
+
+    Counters take values from one process-wide sequence, so each value names
+    a single generation of a single scope. An evicted counter reads back as
+    the highest evicted value: that is never a generation an entry of its
+    scope was invalidated at, so stale entries stay unreachable.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.counters: "OrderedDict[str, int]" = OrderedDict()
+        self.maxsize = maxsize
+        self._sequence = 0
+        self._evicted_floor = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries.set(key, value, ttl)
+
+    async def get_counter(self, key: str) -> int:
+        value = self.counters.get(key)
+        if value is None:
+            return self._evicted_floor
+        self.counters.move_to_end(key)
+        return value
+
+    async def incr(self, key: str) -> None:
+        self._sequence += 1
+        self.counters[key] = self._sequence
+        self.counters.move_to_end(key)
+        while len(self.counters) > max(1, self.maxsize):
+            _, evicted = self.counters.popitem(last=False)
+            self._evicted_floor = max(self._evicted_floor, evicted)
+
+    async def clear(self) -> None:
+        self.entries.clear()
+        self.counters.clear()
+        self._sequence = 0
+        self._evicted_floor = 0
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared backend for any Redis-compatible store, so every task sees the same
+    entries and invalidations.
+
+    Size is bounded by the store's own eviction policy (e.g. maxmemory with
+    allkeys-lru). Only this backend's keys, under `prefix`, are ever cleared.
+    """
+
+    SCAN_BATCH = 500
+
+    def __init__(self, client, prefix: str = "notes-cache:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("The redis cache backend requires the 'redis' package") from exc
+        return cls(redis.from_url(url))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    async def get_counter(self, key: str) -> int:
+        value = await self.client.get(self.prefix + key)
+        return int(value) if value is not None else 0
+
+    async def incr(self, key: str) -> None:
+        await self.client.incr(self.prefix + key)
+
+    async def clear(self) -> None:
+        # SCAN walks the keyspace in steps instead of blocking the store like KEYS
+        keys = []
+        async for key in self.client.scan_iter(match=self.prefix + "*", count=self.SCAN_BATCH):
+            keys.append(key)
+            if len(keys) >= self.SCAN_BATCH:
+                await self.client.delete(*keys)
+                keys = []
+        if keys:
+            await self.client.delete(*keys)
+
+
+class ResponseCache:
+    """
+    Cache of serialized response bodies, scoped by note owner.
+
+    Each scope (an owner id, or ALL_SCOPE) has a generation counter that is
+    part of every entry key. Invalidating an owner bumps its generation and
+    the admin scope's, so their old entries are never read again and age out
+    of the LRU. Backend errors are logged and treated as misses: the cache
+    only ever saves work.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def _scope(owner_id: Optional[int]) -> str:
+        return ALL_SCOPE if owner_id is None else f"owner:{owner_id}"
+
+    async def _entry_key(self, owner_id: Optional[int], key: str) -> str:
+        scope = self._scope(owner_id)
+        generation = await self.backend.get_counter(f"gen:{scope}")
+        return f"{scope}:{generation}:{key}"
+
+    async def get(self, owner_id: Optional[int], key: str) -> Optional[bytes]:
+        """
+        Return the cached body for `key` in the owner's scope, if any
+        """
+        if self.ttl <= 0:
+            return None
+        try:
+            return await self.backend.get(await self._entry_key(owner_id, key))
+        except Exception:
+            logger.warning("Response cache read failed", exc_info=True)
+            return None
+
+    async def set(self, owner_id: Optional[int], key: str, body: bytes) -> None:
+        """
+        Cache `body` under `key` in the owner's scope
+        """
+        if self.ttl <= 0:
+            return
+        try:
+            await self.backend.set(await self._entry_key(owner_id, key), body, self.ttl)
+        except Exception:
+            logger.warning("Response cache write failed", exc_info=True)
+
+    async def invalidate(self, owner_ids: Iterable[int]) -> None:
+        """
+        Drop every cached entry of the given owners and of the admin scope
+        """
+        try:
+            for owner_id in set(owner_ids):
+                await self.backend.incr(f"gen:{self._scope(owner_id)}")
+            await self.backend.incr(f"gen:{ALL_SCOPE}")
+        except Exception:
+            logger.warning("Response cache invalidation failed", exc_info=True)
+
+    async def clear(self) -> None:
+        """
+        Drop every entry
+        """
+        await self.backend.clear()
+
+
+def build_cache_backend() -> CacheBackend:
+    """
+    Create the backend selected by NOTES_LIST_CACHE_BACKEND
+    """
+    if settings.NOTES_LIST_CACHE_BACKEND == "redis":
+        return RedisCacheBackend.from_url(settings.NOTES_LIST_CACHE_URL)
+    return MemoryCacheBackend(
+        maxsize=settings.NOTES_LIST_CACHE_SIZE, ttl=settings.NOTES_LIST_CACHE_TTL_SECONDS
+    )
+
+
+# Serialized note list pages
+note_list_cache = ResponseCache(build_cache_backend(), ttl=settings.NOTES_LIST_CACHE_TTL_SECONDS)
@@ -0,0 +1,60 @@
+from sqlalchemy import column, func, literal_column, select, table
+from sqlalchemy.sql import Select
+
+from app.models.note import NOTES_SEARCH_VECTOR_SQL, Note
+
+# FTS5 index over notes, created alongside the table on SQLite
+notes_fts_table = table("notes_fts", column("rowid"))
+
+# Dialects with a full-text index behind build_note_search
+SEARCH_DIALECTS = ("postgresql", "sqlite")
+
+
+def check_search_support(dialect_name: str) -> None:
+    """
+    Raise a configuration error at startup when `dialect_name` cannot serve
+    search, rather than failing each search request
+    """
+    if dialect_name not in SEARCH_DIALECTS:
+        raise RuntimeError(
+            f"Full-text search is not supported on {dialect_name}; "
+            f"configure one of: {', '.join(SEARCH_DIALECTS)}"
+        )
+
+
+def fts5_query(q: str) -> str:
+    """
+    Turn free text into an FTS5 query matching all terms.
+
+    Each term is quoted so user input cannot inject FTS5 operators.
+    """
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+
+def build_note_search(dialect_name: str, q: str) -> Select:
+    """
+    Build a ranked `SELECT notes.*` for notes matching `q`, best match first.
+
+    Postgres matches the indexed tsvector expression, so its GIN index applies;
+    SQLite uses the `notes_fts` FTS5 index.
+    """
+    if dialect_name == "postgresql":
+        search_vector = literal_column(f"({NOTES_SEARCH_VECTOR_SQL})")
+        ts_query = func.websearch_to_tsquery(literal_column("'english'::regconfig"), q)
+        return (
+            select(Note)
+            .where(search_vector.op("@@")(ts_query))
+            .order_by(func.ts_rank(search_vector, ts_query).desc(), Note.id.desc())
+        )
+    
+    if dialect_name == "sqlite":
+        notes_fts = literal_column("notes_fts")
+        return (
+            select(Note)
+            .join(notes_fts_table, notes_fts_table.c.rowid == Note.id)
+            .where(notes_fts.op("MATCH")(fts5_query(q)))
+            .order_by(func.bm25(notes_fts), Note.id.desc())
+        )
+    
+    # Unreachable once check_search_support has passed at startup
+    raise NotImplementedError(f"Full-text search is not supported on {dialect_name}")
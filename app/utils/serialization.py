@@ -0,0 +1,86 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+from app.models.note import Note
+from app.schemas.note import NotePage, NoteResponse, NoteRow
+from app.schemas.user import PaginationMeta
+
+# Columns behind NoteResponse, in its field order
+NOTE_FIELDS = tuple(NoteResponse.model_fields)
+NOTE_COLUMNS = tuple(getattr(Note, name) for name in NOTE_FIELDS)
+
+# Serializers built once; dump_json encodes dicts in Rust without validating them
+note_adapter = TypeAdapter(NoteRow)
+note_page_adapter = TypeAdapter(NotePage)
+
+
+def note_row(note: Note) -> Dict[str, Any]:
+    """
+    Read the NoteResponse fields off a loaded note
+    """
+    return {name: getattr(note, name) for name in NOTE_FIELDS}
+
+
+def parse_note_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse a `fields=id,title` parameter into NoteResponse field names, in field order.
+
+    Raises ValueError naming any unknown field.
+    """
+    if fields is None:
+        return NOTE_FIELDS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(NOTE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    if not requested:
+        raise ValueError("No fields requested")
+    return tuple(name for name in NOTE_FIELDS if name in requested)
+
+
+def note_columns(fields: Tuple[str, ...], *required: str) -> list:
+    """
+    Columns to select for `fields`, plus `required` ones the query itself needs
+    """
+    return [getattr(Note, name) for name in NOTE_FIELDS if name in fields or name in required]
+
+
+def note_rows(rows: Iterable, fields: Tuple[str, ...] = NOTE_FIELDS) -> List[Dict[str, Any]]:
+    """
+    Turn selected rows into NoteRow dicts holding only `fields`
+    """
+    if fields == NOTE_FIELDS:
+        return [row._asdict() for row in rows]
+    return [{name: getattr(row, name) for name in fields} for row in rows]
+
+
+@lru_cache(maxsize=None)
+def note_page_adapter_for(fields: Tuple[str, ...]) -> TypeAdapter:
+    """
+    Page serializer for a sparse fieldset, built once per field combination
+    """
+    if fields == NOTE_FIELDS:
+        return note_page_adapter
+    suffix = "_".join(fields)
+    row = TypedDict(f"NoteRow_{suffix}", {name: NoteRow.__annotations__[name] for name in fields})
+    page = TypedDict(f"NotePage_{suffix}", {"items": List[row], "meta": PaginationMeta})
+    return TypeAdapter(page)
+
+
+class RawJSONResponse(JSONResponse):
+    """
+    JSON response that sends already encoded bytes as they are.
+
+    Handlers that serialize with a TypeAdapter return this, which skips
+    FastAPI's response_model validation and jsonable_encoder; the route's
+    response_model still documents the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return super().render(content)
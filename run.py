@@ -1,4 +1,47 @@
 import uvicorn
 
+from app.core.config import settings
+from app.core.server import APP, gunicorn_options, log_config, prepare_metrics_dir, worker_count
+
+
+def run_development() -> None:
+    """Single auto-reloading process"""
+    uvicorn.run(APP, host=settings.HOST, port=settings.PORT, reload=True, log_config=log_config())
+
+
+def run_production() -> None:
+    """Pre-forked workers under gunicorn, or uvicorn's own supervisor without it"""
+    prepare_metrics_dir()
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        uvicorn.run(
+            APP,
+            host=settings.HOST,
+            port=settings.PORT,
+            workers=worker_count(),
+            backlog=settings.SERVER_BACKLOG,
+            timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+            timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+            log_config=log_config(),
+        )
+        return
+
+    class Server(BaseApplication):
+        def load_config(self):
+            for key, value in gunicorn_options().items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+
+            return app
+
+    Server().run()
+
+
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    if settings.ENVIRONMENT == "development":
+        run_development()
+    else:
+        run_production()
@@ -0,0 +1,76 @@
+"""
+Measure the per-request cost of MetricsMiddleware.
+
+Calls a minimal FastAPI app directly over ASGI (no sockets), with and
+without the middleware, alternating rounds, and prints the best mean time
+per request of each.
+
+    PYTHONPATH=. python scripts/bench_metrics.py [requests] [rounds]
+"""
+import asyncio
+import sys
+import time
+
+from fastapi import FastAPI
+
+from app.core.middleware import MetricsMiddleware
+
+
+def build_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def scope(i):
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/items/{i}",
+            "raw_path": f"/items/{i}".encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [],
+            "client": ("127.0.0.1", 1234),
+            "server": ("127.0.0.1", 8000),
+        }
+
+    for i in range(1000):
+        await app(scope(i), receive, send)
+    started = time.perf_counter()
+    for i in range(requests):
+        await app(scope(i), receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    plain, instrumented = build_app(False), build_app(True)
+    baseline = measured = float("inf")
+    for _ in range(rounds):
+        baseline = min(baseline, asyncio.run(run(plain, requests)))
+        measured = min(measured, asyncio.run(run(instrumented, requests)))
+    print(f"without metrics: {baseline * 1e6:8.1f} us/request")
+    print(f"with metrics:    {measured * 1e6:8.1f} us/request")
+    print(f"overhead:        {(measured - baseline) * 1e6:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
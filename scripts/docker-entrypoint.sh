@@ -38,6 +38,6 @@ wait_for_db
 echo "Applying database migrations..."
 alembic upgrade head
 
-# Start the FastAPI application
-echo "Starting FastAPI application..."
+# Start the FastAPI application (multi-worker unless ENVIRONMENT=development)
+echo "Starting FastAPI application in ${ENVIRONMENT:-development} mode..."
 exec python run.py
\ No newline at end of file
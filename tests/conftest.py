@@ -1,3 +1,4 @@
+import asyncio
 import os
 import pytest
 from typing import Any, Generator
@@ -6,11 +7,20 @@ from dotenv import load_dotenv
 
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
-from app.db.session import Base, get_db
+from app.core.config import settings
+from app.core.deps import principal_cache, token_denylist
+from app.db.session import Base, get_async_db, get_async_read_db, get_async_read_sessionmaker
 from app.main import app
+from app.utils.pagination import count_cache
+from app.utils.response_cache import note_list_cache
+
+# Fail any request that repeats a statement past the N+1 threshold
+settings.QUERY_REPEAT_FAIL = True
 
 # Load test environment variables
 env_test_path = Path('.env.test')
@@ -23,6 +33,7 @@ USE_SQLITE = os.getenv("USE_SQLITE", "").lower() in ("true", "1", "yes")
 if USE_SQLITE:
     # Use SQLite for testing (faster for CI)
     SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
+    ASYNC_SQLALCHEMY_TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
     connect_args = {"check_same_thread": False}
 else:
     # Use PostgreSQL for more production-like testing
@@ -33,6 +44,7 @@ else:
     POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
     
     SQLALCHEMY_TEST_DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    ASYNC_SQLALCHEMY_TEST_DATABASE_URL = SQLALCHEMY_TEST_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
     connect_args = {}
 
 # Create the database engine with appropriate arguments
@@ -41,6 +53,13 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The app talks to the same database through the async driver. Each TestClient
+# runs its own event loop, so connections must not be pooled across tests.
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_TEST_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="function")
 def db() -> Generator:
@@ -53,6 +72,13 @@ def db() -> Generator:
     # Create a new session
     db = TestingSessionLocal()
     
+    # The app writes through its own async session, so queries made by tests
+    # must refresh rows already in the identity map instead of returning stale state
+    @event.listens_for(db, "do_orm_execute")
+    def populate_existing(orm_execute_state):
+        if orm_execute_state.is_select:
+            orm_execute_state.update_execution_options(populate_existing=True)
+    
     try:
         yield db
     finally:
@@ -87,15 +113,21 @@ def db() -> Generator:
 @pytest.fixture(scope="function")
 def client(db) -> Generator:
     """
-    Create a FastAPI TestClient that uses the `db` fixture to override
-    the dependency injection
+    Create a FastAPI TestClient whose database dependencies point at the
+    test database
     """
-    def override_get_db():
-        try:
-            yield db
-        finally:
-            pass
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
 
-    app.dependency_overrides[get_db] = override_get_db
+    # Ids are reused between tests, so never carry principals over
+    principal_cache.clear()
+    token_denylist.clear()
+    count_cache.clear()
+    asyncio.run(note_list_cache.clear())
+    
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_sessionmaker] = lambda: TestingAsyncSessionLocal
     with TestClient(app) as c:
         yield c
\ No newline at end of file
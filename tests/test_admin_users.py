@@ -2,9 +2,10 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.main import app
 from app.models.user import User, UserRole
-from tests.utils import create_test_user
+from tests.utils import create_test_user, create_test_note
 
 
 @pytest.fixture(scope="function")
@@ -84,6 +85,38 @@ def test_get_user_details_as_admin(client: TestClient, db: Session):
     assert "notes" in data  # Should include notes field
 
 
+@pytest.mark.usefixtures("clean_tables")
+def test_get_user_details_bounds_notes(client: TestClient, db: Session):
+    """Test that user details embed only the recent notes, with a link to the rest and stats"""
+    admin_user = create_test_user(db, email="admin@example.com", role=UserRole.ADMIN)
+    admin_token = create_user_token(client, admin_user.email)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    
+    user = create_test_user(db, email="user@example.com")
+    notes = [create_test_note(db, user.id, f"Note {i}") for i in range(3)]
+    
+    response = client.get(f"/api/v1/admin/users/{user.id}?notes_limit=2", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [note["id"] for note in data["notes"]] == [notes[2].id, notes[1].id]
+    assert data["note_stats"]["count"] == 3
+    assert data["note_stats"]["first_note_at"] == notes[0].created_at.isoformat()
+    assert data["note_stats"]["last_note_at"] == notes[2].created_at.isoformat()
+    assert data["note_stats"]["last_activity_at"] is not None
+    
+    # The link continues with the user's older notes
+    response = client.get(data["notes_next"], headers=headers)
+    assert [note["id"] for note in response.json()["items"]] == [notes[0].id]
+    
+    response = client.get(f"/api/v1/admin/users/{admin_user.id}", headers=headers)
+    data = response.json()
+    assert data["notes"] == []
+    assert data["notes_next"] is None
+    assert data["note_stats"] == {
+        "count": 0, "first_note_at": None, "last_note_at": None, "last_activity_at": None
+    }
+
+
 @pytest.mark.usefixtures("clean_tables")
 def test_update_user_role_as_admin(client: TestClient, db: Session):
     """Test updating user role as admin"""
@@ -154,6 +187,81 @@ def test_admin_cannot_deactivate_self(client: TestClient, db: Session):
     assert "cannot deactivate themselves" in response.json()["detail"]
 
 
+@pytest.mark.usefixtures("clean_tables")
+def test_deactivation_applies_to_cached_principal(client: TestClient, db: Session):
+    """Test that deactivating a user revokes access even after their principal was cached"""
+    # Create an admin user
+    admin_user = create_test_user(db, email="admin@example.com", role=UserRole.ADMIN)
+    admin_token = create_user_token(client, admin_user.email)
+    
+    # Create a regular user and warm the principal cache
+    user = create_test_user(db, email="user@example.com")
+    user_token = create_user_token(client, user.email)
+    response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 200
+    
+    # Deactivate the user
+    response = client.put(
+        f"/api/v1/admin/users/{user.id}/status",
+        headers={"Authorization": f"Bearer {admin_token}"},
+        json={"is_active": False}
+    )
+    assert response.status_code == 200
+    
+    # The very next request is rejected
+    response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 401
+
+
+@pytest.mark.usefixtures("clean_tables")
+def test_demotion_applies_to_cached_principal(client: TestClient, db: Session):
+    """Test that demoting an admin removes admin access immediately"""
+    # Create two admins and warm the cache for the second one
+    admin_user = create_test_user(db, email="admin@example.com", role=UserRole.ADMIN)
+    admin_token = create_user_token(client, admin_user.email)
+    other_admin = create_test_user(db, email="other@example.com", role=UserRole.ADMIN)
+    other_token = create_user_token(client, other_admin.email)
+    response = client.get("/api/v1/admin/users/", headers={"Authorization": f"Bearer {other_token}"})
+    assert response.status_code == 200
+    
+    # Demote the second admin
+    response = client.put(
+        f"/api/v1/admin/users/{other_admin.id}/role",
+        headers={"Authorization": f"Bearer {admin_token}"},
+        json={"role": "user"}
+    )
+    assert response.status_code == 200
+    
+    # The old token carried the admin role and is revoked
+    response = client.get("/api/v1/admin/users/", headers={"Authorization": f"Bearer {other_token}"})
+    assert response.status_code == 401
+    
+    # A new token is issued with the demoted role
+    other_token = create_user_token(client, other_admin.email)
+    response = client.get("/api/v1/admin/users/", headers={"Authorization": f"Bearer {other_token}"})
+    assert response.status_code == 403
+
+
+@pytest.mark.usefixtures("clean_tables")
+def test_demotion_by_other_worker_applies_to_cached_principal(
+    client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that a cached principal is dropped once a synced token version outdates it"""
+    monkeypatch.setattr(settings, "TOKEN_DENYLIST_SYNC_SECONDS", 0)
+    admin_user = create_test_user(db, email="admin@example.com", role=UserRole.ADMIN)
+    admin_token = create_user_token(client, admin_user.email)
+    response = client.get("/api/v1/admin/users/", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    
+    # Another worker demotes the admin: only the users row changes, not this cache
+    admin_user.role = UserRole.USER
+    admin_user.token_version += 1
+    db.commit()
+    
+    response = client.get("/api/v1/admin/users/", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 401
+
+
 # Helper function to create token for a user
 def create_user_token(client: TestClient, email: str) -> str:
     """Helper to create a user token for testing"""
@@ -161,4 +269,4 @@ def create_user_token(client: TestClient, email: str) -> str:
         "/api/v1/auth/login",
         data={"username": email, "password": "password123"},
     )
-    return response.json()["access_token"]
\ No newline at end of file
+    return response.json()["access_token"]
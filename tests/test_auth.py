@@ -1,10 +1,15 @@
+import asyncio
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.main import app
 from app.models.user import User, UserRole
-from app.utils.auth import get_password_hash
-from tests.utils import create_test_user
+from app.utils.auth import get_password_hash, hash_pool
+from tests.utils import create_test_user, get_auth_header
 
 
 def test_register_user(client: TestClient, db: Session):
@@ -134,4 +139,208 @@ def test_get_current_user(client: TestClient, db: Session):
     data = response.json()
     assert data["email"] == user.email
     assert data["name"] == user.name
-    assert data["id"] == user.id
\ No newline at end of file
+    assert data["id"] == user.id
+
+
+def test_logout_revokes_token(client: TestClient, db: Session):
+    """
+    Test that logging out rejects previously issued tokens
+    """
+    create_test_user(db)
+    headers = get_auth_header(client)
+    
+    response = client.post("/api/v1/auth/logout", headers=headers)
+    assert response.status_code == 200
+    
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 401
+    
+    # A fresh login works again
+    response = client.get("/api/v1/auth/me", headers=get_auth_header(client))
+    assert response.status_code == 200
+
+
+def test_stateless_auth(client: TestClient, db: Session, monkeypatch):
+    """
+    Test the stateless mode trusts claims and still honors revocation
+    """
+    monkeypatch.setattr(settings, "STATELESS_AUTH", True)
+    user = create_test_user(db)
+    headers = get_auth_header(client)
+    
+    # Profile is loaded on demand
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == user.email
+    
+    response = client.post("/api/v1/notes/", json={"title": "Stateless"}, headers=headers)
+    assert response.status_code == 201
+    
+    # Revocation is visible to the denylist immediately
+    response = client.post("/api/v1/auth/logout", headers=headers)
+    assert response.status_code == 200
+    response = client.get("/api/v1/notes/", headers=headers)
+    assert response.status_code == 401
+
+
+def test_stateless_auth_syncs_revocations(client: TestClient, db: Session, monkeypatch):
+    """
+    Test that revocations written by another process are picked up by the sync
+    """
+    monkeypatch.setattr(settings, "STATELESS_AUTH", True)
+    user = create_test_user(db)
+    headers = get_auth_header(client)
+    
+    # Simulate a revocation made elsewhere
+    user.token_version += 1
+    db.commit()
+    
+    response = client.get("/api/v1/notes/", headers=headers)
+    assert response.status_code == 401
+
+
+def test_stateless_auth_deleted_user(client: TestClient, db: Session, monkeypatch):
+    """
+    Test that /me rejects a stateless token whose user no longer exists
+    """
+    monkeypatch.setattr(settings, "STATELESS_AUTH", True)
+    user = create_test_user(db)
+    headers = get_auth_header(client)
+    
+    db.delete(user)
+    db.commit()
+    
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 401
+
+
+def test_login_rejected_when_hash_pool_full(client: TestClient, db: Session, monkeypatch):
+    """
+    Test that logins beyond the hash pool capacity get a fast 503
+    """
+    create_test_user(db)
+    monkeypatch.setattr(hash_pool, "pending", hash_pool.max_pending)
+    
+    response = client.post(
+        "/api/v1/auth/login", data={"username": "test@example.com", "password": "password123"}
+    )
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+
+
+def test_hash_pool_stats(client: TestClient, db: Session):
+    """
+    Test that hashing in the pool is counted and timed
+    """
+    create_test_user(db)
+    completed = hash_pool.stats()["completed"]
+    
+    get_auth_header(client)
+    
+    stats = hash_pool.stats()
+    assert stats["completed"] == completed + 1
+    assert stats["pending"] == 0
+    assert stats["hash_seconds_total"] > 0
+
+
+def test_refresh_token_rotation(client: TestClient, db: Session):
+    """
+    Test renewing an access token with a refresh token
+    """
+    create_test_user(db)
+    response = client.post(
+        "/api/v1/auth/login", data={"username": "test@example.com", "password": "password123"}
+    )
+    refresh_token = response.json()["refresh_token"]
+    assert refresh_token
+    completed = hash_pool.stats()["completed"]
+    
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["refresh_token"] != refresh_token
+    
+    # No password hashing was needed
+    assert hash_pool.stats()["completed"] == completed
+    
+    response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {data['access_token']}"})
+    assert response.status_code == 200
+    
+    # Replaying the rotated token revokes the whole session
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": data["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_concurrent_refresh(client: TestClient, db: Session):
+    """
+    Test that two concurrent refreshes of one token cannot both succeed
+    """
+    create_test_user(db)
+    response = client.post(
+        "/api/v1/auth/login", data={"username": "test@example.com", "password": "password123"}
+    )
+    refresh_token = response.json()["refresh_token"]
+    
+    async def refresh_twice():
+        async with httpx.AsyncClient(app=app, base_url="http://testserver") as async_client:
+            return await asyncio.gather(*[
+                async_client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+                for _ in range(2)
+            ])
+    
+    responses = asyncio.run(refresh_twice())
+    assert sorted(r.status_code for r in responses) == [200, 401]
+    
+    # The loser counts as a replay, so the winner's new tokens are revoked too
+    winner = next(r for r in responses if r.status_code == 200).json()
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": winner["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_revoked_refresh_token(client: TestClient, db: Session):
+    """
+    Test that explicitly revoked and logged-out refresh tokens are rejected
+    """
+    create_test_user(db)
+    login = {"username": "test@example.com", "password": "password123"}
+    first = client.post("/api/v1/auth/login", data=login).json()
+    second = client.post("/api/v1/auth/login", data=login).json()
+    
+    response = client.post("/api/v1/auth/revoke", json={"refresh_token": first["refresh_token"]})
+    assert response.status_code == 200
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": first["refresh_token"]})
+    assert response.status_code == 401
+    
+    # Revoking one device leaves the other session alone
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": second["refresh_token"]})
+    assert response.status_code == 200
+    second = response.json()
+    
+    # Logout invalidates the remaining refresh tokens
+    client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {second['access_token']}"})
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": second["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_get_current_user_etag(client: TestClient, db: Session):
+    """
+    Test that /auth/me revalidates with If-None-Match and tracks note counters
+    """
+    create_test_user(db)
+    login_response = client.post(
+        "/api/v1/auth/login", data={"username": "test@example.com", "password": "password123"}
+    )
+    auth_header = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    
+    response = client.get("/api/v1/auth/me", headers=auth_header)
+    etag = response.headers["etag"]
+    
+    response = client.get("/api/v1/auth/me", headers={**auth_header, "If-None-Match": etag})
+    assert response.status_code == 304
+    
+    client.post("/api/v1/notes/", json={"title": "New"}, headers=auth_header)
+    response = client.get("/api/v1/auth/me", headers={**auth_header, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["note_count"] == 1
@@ -0,0 +1,111 @@
+import asyncio
+import gzip
+import json
+
+import zstandard
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.utils.compression import negotiate_encoding
+from app.utils.response_cache import note_list_cache
+from tests.utils import create_test_user, create_test_note, get_auth_header
+
+
+def test_negotiate_encoding():
+    """
+    Test Accept-Encoding negotiation against the configured preference
+    """
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip, br, zstd") == "zstd"
+    assert negotiate_encoding("zstd;q=0, br;q=0.5, gzip") == "br"
+    assert negotiate_encoding("*") == "zstd"
+    assert negotiate_encoding("*, zstd;q=0, br;q=0") == "gzip"
+
+
+def test_small_response_not_compressed(client: TestClient):
+    """
+    Test that bodies under the threshold go out as they are
+    """
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_note_list_compressed_and_cached(client: TestClient, db: Session):
+    """
+    Test that large list pages are compressed once and reused from the cache
+    """
+    user = create_test_user(db)
+    for i in range(5):
+        create_test_note(db, user.id, f"Note {i}", "lorem ipsum " * 100)
+    auth_header = get_auth_header(client)
+    
+    response = client.get("/api/v1/notes/", headers={**auth_header, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["items"]) == 5
+    
+    etag = response.headers["etag"]
+    assert etag.endswith('-gzip"')
+    identity_etag = etag.replace('-gzip"', '"')
+    cached = asyncio.run(note_list_cache.get(user.id, f"{identity_etag}:gzip"))
+    assert json.loads(gzip.decompress(cached)) == response.json()
+    
+    with client.stream(
+        "GET", "/api/v1/notes/", headers={**auth_header, "Accept-Encoding": "zstd"}
+    ) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "zstd"
+    assert len(json.loads(zstandard.ZstdDecompressor().decompressobj().decompress(raw))["items"]) == 5
+
+
+def test_streamed_export_compressed(client: TestClient, db: Session):
+    """
+    Test that streamed bodies are compressed incrementally
+    """
+    user = create_test_user(db)
+    notes = [create_test_note(db, user.id, f"Note {i}") for i in range(3)]
+    
+    response = client.get(
+        "/api/v1/notes/export", headers={**get_auth_header(client), "Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [note.id for note in notes]
+
+
+def test_encoded_responses_have_own_etag(client: TestClient, db: Session):
+    """
+    Test that each encoding gets its own ETag, that validators accept either
+    form, and that uncompressed responses still vary on Accept-Encoding
+    """
+    user = create_test_user(db)
+    note = create_test_note(db, user.id, "Big", "lorem ipsum " * 100)
+    auth_header = get_auth_header(client)
+    url = f"/api/v1/notes/{note.id}"
+    
+    response = client.get(url, headers={**auth_header, "Accept-Encoding": "identity"})
+    identity_etag = response.headers["etag"]
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    
+    response = client.get(url, headers={**auth_header, "Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    gzip_etag = response.headers["etag"]
+    assert gzip_etag == identity_etag[:-1] + '-gzip"'
+    
+    response = client.get(url, headers={**auth_header, "Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == gzip_etag
+    assert response.headers["vary"] == "Accept-Encoding"
+    
+    response = client.get(url, headers={**auth_header, "Accept-Encoding": "identity", "If-None-Match": gzip_etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == identity_etag
+    
+    response = client.put(url, json={"title": "Bigger"}, headers={**auth_header, "If-Match": gzip_etag})
+    assert response.status_code == 200
+    response = client.put(url, json={"title": "Stale"}, headers={**auth_header, "If-Match": gzip_etag})
+    assert response.status_code == 412
@@ -0,0 +1,88 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db.pool import TimedQueuePool, engine_options, instrument_pool, pool_status
+
+
+def make_engine():
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=2, max_overflow=1)
+    instrument_pool(engine, "test")
+    return engine
+
+
+def test_pool_status_counts_checkouts_and_churn():
+    """Checkouts are timed, saturation follows occupancy and connections are counted"""
+    engine = make_engine()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        status = pool_status(engine)
+        assert status["checked_out"] == 1
+        assert status["capacity"] == 3
+        assert status["saturation"] == round(1 / 3, 3)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    status = pool_status(engine)
+    assert status["checked_out"] == 0
+    assert status["checkouts"] == 2
+    assert status["connects"] == 1
+    assert status["wait_ms_max"] >= status["wait_ms_avg"] >= 0
+
+    engine.dispose()
+    assert pool_status(engine)["closes"] == 1
+
+
+def test_idle_connections_are_pinged(monkeypatch):
+    """Only connections idle past the threshold are pinged"""
+    engine = make_engine()
+    with engine.connect():
+        pass
+    with engine.connect():
+        pass
+    assert pool_status(engine)["pings"] == 0
+
+    monkeypatch.setattr(settings, "DB_POOL_PING_IDLE_SECONDS", 0)
+    with engine.connect():
+        pass
+    assert pool_status(engine)["pings"] == 1
+
+
+def test_failed_ping_replaces_connection(monkeypatch):
+    """A connection failing its ping is discarded and a fresh one is handed out"""
+    engine = make_engine()
+    with engine.connect():
+        pass
+
+    monkeypatch.setattr(settings, "DB_POOL_PING_IDLE_SECONDS", 0)
+    pings = iter([False])
+    monkeypatch.setattr(engine.dialect, "do_ping", lambda conn: next(pings, True))
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+    status = pool_status(engine)
+    assert status["failed_pings"] == 1
+    assert status["invalidations"] == 1
+    assert status["connects"] == 2
+
+
+def test_engine_options_from_settings(monkeypatch):
+    """Pool sizing and statement timeouts are configured per engine"""
+    monkeypatch.setattr(settings, "DB_READER_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_READER_STATEMENT_TIMEOUT_MS", 5000)
+    options = engine_options("reader", is_async=True)
+    assert options["pool_size"] == 7
+    assert options["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+    assert "pool_pre_ping" not in options
+
+    monkeypatch.setattr(settings, "DB_WRITER_STATEMENT_TIMEOUT_MS", 0)
+    assert engine_options("writer", is_async=False)["connect_args"] == {}
+
+
+def test_db_pool_health(client: TestClient):
+    """The health endpoint reports both request-serving pools"""
+    response = client.get("/health/db-pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"writer", "reader"}
+    assert "saturation" in data["writer"]
@@ -0,0 +1,74 @@
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy.orm import Session
+
+from app.utils.auth import hash_pool
+from tests.utils import create_test_user, create_test_note, get_auth_header
+
+
+def sample(name, **labels):
+    """Current value of a metric sample, 0 if it was never recorded"""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_requests_labelled_by_route_template(client: TestClient, db: Session):
+    """Requests are counted and timed under their route template, not the raw path"""
+    user = create_test_user(db, email="test@example.com", password="password123")
+    note = create_test_note(db, user.id)
+    headers = get_auth_header(client)
+    labels = {"method": "GET", "route": "/api/v1/notes/{note_id}", "status": "200"}
+    before = sample("http_requests_total", **labels)
+    observed_before = sample("http_request_duration_seconds_count", **labels)
+
+    client.get(f"/api/v1/notes/{note.id}", headers=headers)
+    client.get(f"/api/v1/notes/{note.id}", headers=headers)
+
+    assert sample("http_requests_total", **labels) == before + 2
+    assert sample("http_request_duration_seconds_count", **labels) == observed_before + 2
+    missing = {"method": "GET", "route": "/api/v1/notes/{note_id}", "status": "404"}
+    before_missing = sample("http_requests_total", **missing)
+    client.get("/api/v1/notes/999999", headers=headers)
+    assert sample("http_requests_total", **missing) == before_missing + 1
+
+
+def test_unmatched_paths_share_one_series(client: TestClient):
+    """Unknown paths never create per-path series"""
+    labels = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = sample("http_requests_total", **labels)
+    client.get("/no/such/path/1")
+    client.get("/no/such/path/2")
+    assert sample("http_requests_total", **labels) == before + 2
+
+
+def test_metrics_endpoint(client: TestClient):
+    """/metrics serves the text format with in-flight, pool and threadpool gauges"""
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in body
+    assert "http_requests_in_flight 1.0" in body
+    assert 'db_pool_connections{engine="writer",state="capacity"}' in body
+    assert 'db_pool_saturation{engine="reader"}' in body
+    assert 'threadpool_threads{state="total"}' in body
+
+
+def test_password_hash_metrics(client: TestClient, db: Session, monkeypatch):
+    """Hash pool work, queue depth and rejections are exported"""
+    create_test_user(db, email="test@example.com", password="password123")
+    hashes_before = sample("password_hash_duration_seconds_count")
+    rejections_before = sample("password_hash_rejections_total")
+
+    get_auth_header(client)
+    assert sample("password_hash_duration_seconds_count") == hashes_before + 1
+    assert sample("password_hash_wait_seconds_count") >= 1
+    assert sample("password_hashes_pending") == 0
+
+    monkeypatch.setattr(hash_pool, "pending", hash_pool.max_pending)
+    response = client.post(
+        "/api/v1/auth/login", data={"username": "test@example.com", "password": "password123"}
+    )
+    assert response.status_code == 503
+    assert sample("password_hash_rejections_total") == rejections_before + 1
+    assert "password_hashes_pending" in client.get("/metrics").text
@@ -1,21 +1,21 @@
+import csv
+import io
+import json
+from datetime import datetime
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
 
 from app.models.user import User, UserRole
+from app.api.endpoints.notes import _locked_bytes_by_owner
 from app.models.note import Note
-from tests.utils import create_test_user, create_test_note
-
-
-def get_auth_header(client, user_email="test@example.com", user_password="password123"):
-    """Helper function to get authentication headers"""
-    login_data = {
-        "username": user_email,  # OAuth2 form expects 'username', not 'email'
-        "password": user_password
-    }
-    login_response = client.post("/api/v1/auth/login", data=login_data)
-    token = login_response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+from app.schemas.note import NoteResponse
+from app.utils.note_stats import description_bytes, description_bytes_expr, reconcile_note_counters
+from app.utils.pagination import encode_cursor
+from tests.utils import create_test_user, create_test_note, get_auth_header
 
 
 def test_create_note(client: TestClient, db: Session):
@@ -179,4 +179,669 @@ def test_delete_note(client: TestClient, db: Session):
     
     # Check that the note was actually deleted from the database
     deleted_note = db.query(Note).filter(Note.id == note.id).first()
-    assert deleted_note is None
\ No newline at end of file
+    assert deleted_note is None
+
+def test_get_notes_cursor_pagination(client: TestClient, db: Session):
+    """
+    Test walking the notes list with keyset cursors
+    """
+    # Create a test user
+    user = create_test_user(db)
+    auth_header = get_auth_header(client)
+    
+    # Create notes that share the same timestamp to exercise the id tie-break
+    for i in range(5):
+        note = create_test_note(db, user.id, f"Note {i}", f"Description {i}")
+        note.created_at = datetime(2025, 1, 1, 12, 0, 0)
+    db.commit()
+    
+    # First page via the regular page/size contract
+    response = client.get("/api/v1/notes/?size=2", headers=auth_header)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["meta"]["page"] == 1
+    assert data["meta"]["total"] == 5
+    seen = [note["id"] for note in data["items"]]
+    cursor = data["meta"]["next_cursor"]
+    assert cursor is not None
+    
+    # Follow the cursors until the last page
+    while cursor:
+        response = client.get(f"/api/v1/notes/?size=2&cursor={cursor}", headers=auth_header)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["meta"]["page"] is None
+        seen.extend(note["id"] for note in data["items"])
+        cursor = data["meta"]["next_cursor"]
+    
+    # Every note is returned exactly once in descending id order
+    assert seen == sorted(seen, reverse=True)
+    assert len(set(seen)) == 5
+
+
+def test_get_notes_invalid_cursor(client: TestClient, db: Session):
+    """
+    Test that a malformed cursor is rejected
+    """
+    # Create a test user
+    create_test_user(db)
+    auth_header = get_auth_header(client)
+    
+    response = client.get("/api/v1/notes/?cursor=not-a-cursor", headers=auth_header)
+    assert response.status_code == 400
+
+
+def test_get_notes_cursor_with_offset(client: TestClient, db: Session):
+    """
+    Test that a cursor timestamp with a UTC offset is compared as UTC
+    """
+    user = create_test_user(db)
+    auth_header = get_auth_header(client)
+    for i in range(2):
+        note = create_test_note(db, user.id, f"Note {i}")
+        note.created_at = datetime(2025, 1, 1, 12, 0, 0)
+    db.commit()
+    
+    # 13:00+02:00 is 11:00 UTC, before every note
+    cursor = encode_cursor(datetime.fromisoformat("2025-01-01T13:00:00+02:00"), 10**6)
+    response = client.get(f"/api/v1/notes/?cursor={cursor}", headers=auth_header)
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+    
+    cursor = encode_cursor(datetime.fromisoformat("2025-01-01T15:00:00+02:00"), 10**6)
+    response = client.get(f"/api/v1/notes/?cursor={cursor}", headers=auth_header)
+    assert len(response.json()["items"]) == 2
+
+
+def test_get_notes_total_strategies(client: TestClient, db: Session):
+    """
+    Test the exact, cached, estimated and none total strategies
+    """
+    # Create a regular user and an admin
+    user = create_test_user(db)
+    auth_header = get_auth_header(client)
+    create_test_user(db, email="admin@example.com", role=UserRole.ADMIN)
+    admin_header = get_auth_header(client, "admin@example.com")
+    for i in range(3):
+        create_test_note(db, user.id, f"Note {i}")
+    
+    # Skipping the count still reports whether more pages follow
+    response = client.get("/api/v1/notes/?size=2&total=none", headers=auth_header)
+    meta = response.json()["meta"]
+    assert meta["total"] is None
+    assert meta["pages"] is None
+    assert meta["has_more"] is True
+    assert meta["total_strategy"] == "none"
+    
+    # Cached totals are memoized per filter
+    response = client.get("/api/v1/notes/?total=cached", headers=admin_header)
+    assert response.json()["meta"]["total"] == 3
+    create_test_note(db, user.id, "Note 3")
+    response = client.get("/api/v1/notes/?total=cached", headers=admin_header)
+    assert response.json()["meta"]["total"] == 3
+    assert response.json()["meta"]["total_strategy"] == "cached"
+    
+    # Exact is the default
+    response = client.get("/api/v1/notes/", headers=admin_header)
+    meta = response.json()["meta"]
+    assert meta["total"] == 4
+    assert meta["total_strategy"] == "exact"
+    assert meta["has_more"] is False
+    
+    # Estimates need planner statistics and fall back to exact elsewhere
+    response = client.get("/api/v1/notes/?total=estimated", headers=admin_header)
+    meta = response.json()["meta"]
+    assert meta["total"] is not None
+    if db.get_bind().dialect.name != "postgresql":
+        assert meta["total"] == 4
+        assert meta["total_strategy"] == "exact"
+    
+    # A single owner's total always comes from the exact per-user counter
+    response = client.get("/api/v1/notes/?total=cached", headers=auth_header)
+    meta = response.json()["meta"]
+    assert meta["total"] == 4
+    assert meta["total_strategy"] == "exact"
+
+
+def test_note_counters(client: TestClient, db: Session):
+    """
+    Test that note writes keep the owner's counters current
+    """
+    user = create_test_user(db)
+    auth_header = get_auth_header(client)
+    
+    response = client.post("/api/v1/notes/", json={"title": "A", "description": "héllo"}, headers=auth_header)
+    note_id = response.json()["id"]
+    client.post("/api/v1/notes/", json={"title": "B"}, headers=auth_header)
+    db.refresh(user)
+    assert (user.note_count, user.note_bytes) == (2, 6)
+    
+    client.put(f"/api/v1/notes/{note_id}", json={"description": "hi"}, headers=auth_header)
+    db.refresh(user)
+    assert (user.note_count, user.note_bytes) == (2, 2)
+    
+    client.delete(f"/api/v1/notes/{note_id}", headers=auth_header)
+    db.refresh(user)
+    assert (user.note_count, user.note_bytes) == (1, 0)
+    
+    response = client.get("/api/v1/auth/me", headers=auth_header)
+    assert response.json()["note_count"] == 1
+
+
+def test_reconcile_note_counters(db: Session):
+    """
+    Test rebuilding drifted counters from the notes table
+    """
+    user = create_test_user(db)
+    other = create_test_user(db, email="other@example.com")
+    create_test_note(db, user.id, "Note", "abc")
+    
+    user.note_count = 7
+    user.note_bytes = 0
+    db.commit()
+    
+    assert reconcile_note_counters(db) == 1
+    db.refresh(user)
+    db.refresh(other)
+    assert (user.note_count, user.note_bytes) == (1, 3)
+    assert (other.note_count, other.note_bytes) == (0, 0)
+
+
+def test_description_bytes_expr(db: Session):
+    """
+    Test that note sizes are byte lengths on every dialect, backslashes included
+    """
+    sql = str(description_bytes_expr("postgresql").compile(dialect=postgresql.dialect()))
+    assert "octet_length(notes.description)" in sql
+    assert "bytea" not in sql.lower()
+    
+    user = create_test_user(db)
+    description = "C:\\x41 café"
+    create_test_note(db, user.id, "Note", description)
+    size = db.scalar(select(description_bytes_expr(db.get_bind().dialect.name)))
+    assert size == description_bytes(description)
+
+
+def test_create_notes_bulk(client: TestClient, db: Session):
+    """
+    Test creating many notes in one request
+    """
+    user = create_test_user(db)
+    auth_header = get_auth_header(client)
+    
+    items = [{"title": f"Bulk {i}", "description": "abc"} for i in range(5)]
+    response = client.post("/api/v1/notes/bulk", json={"items": items}, headers=auth_header)
+    assert response.status_code == 201
+    data = response.json()
+    assert [note["title"] for note in data["items"]] == [f"Bulk {i}" for i in range(5)]
+    assert all(note["owner_id"] == user.id for note in data["items"])
+    assert data["errors"] == []
+    
+    db.refresh(user)
+    assert (user.note_count, user.note_bytes) == (5, 15)
+    assert db.query(Note).filter(Note.owner_id == user.id).count() == 5
+
+
+def test_create_notes_bulk_invalid_items(client: TestClient, db: Session):
+    """
+    Test that invalid bulk items reject the batch unless partial is requested
+    """
+    user = create_test_user(db)
+    auth_header = get_auth_header(client)
+    
+    items = [{"title": "Good"}, {"title": ""}, {"description": "no title"}]
+    response = client.post("/api/v1/notes/bulk", json={"items": items}, headers=auth_header)
+    assert response.status_code == 422
+    assert [error["index"] for error in response.json()["detail"]] == [1, 2]
+    assert db.query(Note).count() == 0
+    
+    response = client.post(
+        "/api/v1/notes/bulk", json={"items": items, "partial": True}, headers=auth_header
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert [note["title"] for note in data["items"]] == ["Good"]
+    assert [error["index"] for error in data["errors"]] == [1, 2]
+    
+    db.refresh(user)
+    assert user.note_count == 1
+
+
+def test_update_notes_bulk(client: TestClient, db: Session):
+    """
+    Test bulk update reports affected, forbidden and missing ids
+    """
+    user = create_test_user(db)
+    other = create_test_user(db, email="other@example.com")
+    mine = [create_test_note(db, user.id, f"Mine {i}", "abcd") for i in range(3)]
+    theirs = create_test_note(db, other.id, "Theirs", "abcd")
+    auth_header = get_auth_header(client)
+    
+    ids = [note.id for note in mine] + [theirs.id, 9999]
+    response = client.put(
+        "/api/v1/notes/bulk", json={"ids": ids, "description": "ab"}, headers=auth_header
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["affected"] == sorted(note.id for note in mine)
+    assert data["forbidden"] == [theirs.id]
+    assert data["missing"] == [9999]
+    
+    db.refresh(user)
+    db.refresh(other)
+    assert (user.note_count, user.note_bytes) == (3, 6)
+    assert (other.note_count, other.note_bytes) == (1, 4)
+    assert db.get(Note, theirs.id).description == "abcd"
+    
+    # A selector is required
+    response = client.put("/api/v1/notes/bulk", json={"title": "New"}, headers=auth_header)
+    assert response.status_code == 422
+
+
+def test_delete_notes_bulk(client: TestClient, db: Session):
+    """
+    Test bulk delete by creation time, and admin bulk delete across owners
+    """
+    user = create_test_user(db)
+    other = create_test_user(db, email="other@example.com")
+    admin = create_test_user(db, email="admin@example.com", role=UserRole.ADMIN)
+    old = create_test_note(db, user.id, "Old", "abc")
+    old.created_at = datetime(2020, 1, 1)
+    theirs_old = create_test_note(db, other.id, "Theirs old", "abc")
+    theirs_old.created_at = datetime(2020, 1, 1)
+    new = create_test_note(db, user.id, "New", "abc")
+    db.commit()
+    old_id, theirs_old_id, new_id = old.id, theirs_old.id, new.id
+    
+    response = client.request(
+        "DELETE",
+        "/api/v1/notes/bulk",
+        json={"created_before": "2021-01-01T00:00:00"},
+        headers=get_auth_header(client)
+    )
+    assert response.status_code == 200
+    assert response.json() == {"affected": [old_id], "forbidden": [], "missing": []}
+    
+    db.refresh(user)
+    assert (user.note_count, user.note_bytes) == (1, 3)
+    
+    response = client.request(
+        "DELETE",
+        "/api/v1/notes/bulk",
+        json={"ids": [theirs_old_id, new_id]},
+        headers=get_auth_header(client, "admin@example.com")
+    )
+    assert response.json()["affected"] == sorted([theirs_old_id, new_id])
+    
+    db.refresh(user)
+    db.refresh(other)
+    assert (user.note_count, user.note_bytes) == (0, 0)
+    assert (other.note_count, other.note_bytes) == (0, 0)
+    assert db.query(Note).count() == 0
+
+
+def test_bulk_created_before_with_offset(client: TestClient, db: Session):
+    """
+    Test that an offset created_before is compared as UTC
+    """
+    user = create_test_user(db)
+    early = create_test_note(db, user.id, "Early")
+    early.created_at = datetime(2020, 1, 1, 10, 0, 0)
+    late = create_test_note(db, user.id, "Late")
+    late.created_at = datetime(2020, 1, 1, 12, 0, 0)
+    db.commit()
+    early_id = early.id
+    
+    # 13:00+02:00 is 11:00 UTC, between the two notes
+    response = client.request(
+        "DELETE",
+        "/api/v1/notes/bulk",
+        json={"created_before": "2020-01-01T13:00:00+02:00"},
+        headers=get_auth_header(client)
+    )
+    assert response.status_code == 200
+    assert response.json()["affected"] == [early_id]
+
+
+def test_bulk_across_many_owners(client: TestClient, db: Session):
+    """
+    Test admin bulk operations across many owners update all counters at once
+    """
+    create_test_user(db, email="admin@example.com", role=UserRole.ADMIN)
+    owners = [create_test_user(db, email=f"owner{i}@example.com") for i in range(12)]
+    for owner in owners:
+        create_test_note(db, owner.id, "Mine", "abc")
+    auth_header = get_auth_header(client, "admin@example.com")
+    ids = [note.id for note in db.query(Note).all()]
+    
+    response = client.put(
+        "/api/v1/notes/bulk", json={"ids": ids, "description": "abcdef"}, headers=auth_header
+    )
+    assert response.status_code == 200
+    for owner in owners:
+        db.refresh(owner)
+        assert (owner.note_count, owner.note_bytes) == (1, 6)
+    
+    response = client.request("DELETE", "/api/v1/notes/bulk", json={"ids": ids}, headers=auth_header)
+    assert response.status_code == 200
+    assert len(response.json()["affected"]) == 12
+    for owner in owners:
+        db.refresh(owner)
+        assert (owner.note_count, owner.note_bytes) == (0, 0)
+
+
+def test_bulk_update_lock_compiles_for_postgres():
+    """
+    Test that the bulk update's row lock is valid Postgres: FOR UPDATE is not
+    allowed at the level of a GROUP BY
+    """
+    stmt = _locked_bytes_by_owner([Note.owner_id == 1], "postgresql")
+    sql = " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+    assert sql.count("FOR UPDATE") == 1
+    assert "FOR UPDATE) AS anon_1 GROUP BY" in sql
+
+
+def test_export_notes(client: TestClient, db: Session, monkeypatch):
+    """
+    Test exporting own notes as NDJSON and CSV across several cursor batches
+    """
+    monkeypatch.setattr("app.utils.export.settings.NOTES_EXPORT_BATCH_SIZE", 2)
+    user = create_test_user(db)
+    other = create_test_user(db, email="other@example.com")
+    notes = [create_test_note(db, user.id, f"Note {i}", f"Line, \"{i}\"\nmore") for i in range(5)]
+    create_test_note(db, other.id, "Not mine")
+    auth_header = get_auth_header(client)
+    
+    response = client.get("/api/v1/notes/export", headers=auth_header)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [note.id for note in notes]
+    assert rows[0]["description"] == notes[0].description
+    
+    response = client.get("/api/v1/notes/export?format=csv", headers=auth_header)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [note.id for note in notes]
+    assert rows[4]["description"] == notes[4].description
+
+
+def test_export_notes_by_user(client: TestClient, db: Session):
+    """
+    Test that exporting another user's notes requires admin
+    """
+    user = create_test_user(db)
+    create_test_user(db, email="admin@example.com", role=UserRole.ADMIN)
+    note = create_test_note(db, user.id)
+    
+    response = client.get(f"/api/v1/notes/by-user/{user.id}/export", headers=get_auth_header(client))
+    assert response.status_code == 403
+    
+    admin_header = get_auth_header(client, "admin@example.com")
+    response = client.get(f"/api/v1/notes/by-user/{user.id}/export", headers=admin_header)
+    assert response.status_code == 200
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [note.id]
+    
+    response = client.get("/api/v1/notes/by-user/9999/export", headers=admin_header)
+    assert response.status_code == 404
+
+
+def test_import_notes(client: TestClient, db: Session, monkeypatch):
+    """
+    Test importing NDJSON in chunks with per-line errors
+    """
+    monkeypatch.setattr("app.api.endpoints.notes.settings.NOTES_IMPORT_CHUNK_SIZE", 2)
+    user = create_test_user(db)
+    auth_header = get_auth_header(client)
+    
+    lines = [
+        json.dumps({"title": "One", "description": "abc"}),
+        "not json",
+        "",
+        json.dumps({"title": "Two"}),
+        json.dumps({"title": ""}),
+        json.dumps({"title": "Three", "description": "de"}),
+    ]
+    response = client.post(
+        "/api/v1/notes/import",
+        content="\n".join(lines).encode(),
+        headers={**auth_header, "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["lines_read"] == 6
+    assert data["committed_lines"] == 6
+    assert data["created"] == 3
+    assert data["error_count"] == 2
+    assert [error["line"] for error in data["errors"]] == [2, 5]
+    
+    titles = [note.title for note in db.query(Note).order_by(Note.id)]
+    assert titles == ["One", "Two", "Three"]
+    db.refresh(user)
+    assert (user.note_count, user.note_bytes) == (3, 5)
+
+
+def test_import_notes_many_chunks(client: TestClient, db: Session, monkeypatch):
+    """
+    Test that an import of many chunks is not mistaken for an N+1 pattern
+    """
+    monkeypatch.setattr("app.api.endpoints.notes.settings.NOTES_IMPORT_CHUNK_SIZE", 1)
+    user = create_test_user(db)
+    lines = [json.dumps({"title": f"Note {i}"}) for i in range(15)]
+    
+    response = client.post(
+        "/api/v1/notes/import?key=many-chunks",
+        content="\n".join(lines).encode(),
+        headers=get_auth_header(client)
+    )
+    assert response.status_code == 200
+    assert response.json()["created"] == 15
+    db.refresh(user)
+    assert user.note_count == 15
+
+
+def test_import_notes_resume(client: TestClient, db: Session, monkeypatch):
+    """
+    Test that re-sending an upload with the same key skips committed lines
+    """
+    monkeypatch.setattr("app.api.endpoints.notes.settings.NOTES_IMPORT_CHUNK_SIZE", 2)
+    create_test_user(db)
+    auth_header = get_auth_header(client)
+    lines = [json.dumps({"title": f"Note {i}"}) for i in range(5)]
+    
+    # The first attempt only got three lines through
+    response = client.post(
+        "/api/v1/notes/import?key=backup-1", content="\n".join(lines[:3]).encode(), headers=auth_header
+    )
+    assert response.json()["committed_lines"] == 3
+    
+    response = client.get("/api/v1/notes/import/backup-1", headers=auth_header)
+    assert response.status_code == 200
+    assert response.json()["committed_lines"] == 3
+    assert response.json()["created"] == 3
+    
+    response = client.post(
+        "/api/v1/notes/import?key=backup-1", content="\n".join(lines).encode(), headers=auth_header
+    )
+    data = response.json()
+    assert data["skipped_lines"] == 3
+    assert data["created"] == 2
+    assert data["committed_lines"] == 5
+    assert db.query(Note).count() == 5
+    
+    response = client.get("/api/v1/notes/import/unknown", headers=auth_header)
+    assert response.status_code == 404
+
+
+def test_import_notes_line_too_long(client: TestClient, db: Session, monkeypatch):
+    """
+    Test that an oversized line is rejected after the earlier chunks commit
+    """
+    monkeypatch.setattr("app.api.endpoints.notes.settings.NOTES_IMPORT_CHUNK_SIZE", 1)
+    monkeypatch.setattr("app.api.endpoints.notes.settings.NOTES_IMPORT_MAX_LINE_BYTES", 100)
+    create_test_user(db)
+    
+    body = json.dumps({"title": "Short"}) + "\n" + json.dumps({"title": "x" * 200})
+    response = client.post("/api/v1/notes/import", content=body.encode(), headers=get_auth_header(client))
+    assert response.status_code == 413
+    assert response.json()["detail"]["committed_lines"] == 1
+    assert db.query(Note).count() == 1
+
+
+def test_get_note_conditional(client: TestClient, db: Session):
+    """
+    Test ETag / Last-Modified revalidation and If-Match on a single note
+    """
+    user = create_test_user(db)
+    note = create_test_note(db, user.id)
+    auth_header = get_auth_header(client)
+    url = f"/api/v1/notes/{note.id}"
+    
+    response = client.get(url, headers=auth_header)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+    
+    response = client.get(url, headers={**auth_header, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    
+    response = client.get(url, headers={**auth_header, "If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    
+    # A stale If-Match is refused and leaves the note alone
+    response = client.put(url, json={"title": "Lost"}, headers={**auth_header, "If-Match": '"stale"'})
+    assert response.status_code == 412
+    
+    response = client.put(url, json={"title": "Saved"}, headers={**auth_header, "If-Match": etag})
+    assert response.status_code == 200
+    new_etag = response.headers["etag"]
+    assert new_etag != etag
+    
+    response = client.get(url, headers={**auth_header, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Saved"
+    
+    response = client.delete(url, headers={**auth_header, "If-Match": etag})
+    assert response.status_code == 412
+    response = client.delete(url, headers={**auth_header, "If-Match": new_etag})
+    assert response.status_code == 200
+
+
+def test_get_notes_conditional(client: TestClient, db: Session):
+    """
+    Test that list ETags change with writes and with the query
+    """
+    user = create_test_user(db)
+    note = create_test_note(db, user.id)
+    auth_header = get_auth_header(client)
+    
+    response = client.get("/api/v1/notes/", headers=auth_header)
+    etag = response.headers["etag"]
+    
+    response = client.get("/api/v1/notes/", headers={**auth_header, "If-None-Match": etag})
+    assert response.status_code == 304
+    
+    response = client.get("/api/v1/notes/?size=5", headers={**auth_header, "If-None-Match": etag})
+    assert response.status_code == 200
+    
+    client.put(f"/api/v1/notes/{note.id}", json={"title": "Changed"}, headers=auth_header)
+    response = client.get("/api/v1/notes/", headers={**auth_header, "If-None-Match": etag})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    
+    client.delete(f"/api/v1/notes/{note.id}", headers=auth_header)
+    response = client.get("/api/v1/notes/", headers={**auth_header, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+
+
+def test_admin_notes_conditional(client: TestClient, db: Session):
+    """
+    Test that the all-notes ETag tracks deletes of the newest note, and that
+    listings ignore If-Modified-Since
+    """
+    user = create_test_user(db)
+    create_test_note(db, user.id, "Older")
+    newest = create_test_note(db, user.id, "Newest")
+    create_test_user(db, email="admin@example.com", role=UserRole.ADMIN)
+    admin_header = get_auth_header(client, "admin@example.com")
+    
+    response = client.get("/api/v1/notes/", headers=admin_header)
+    etag = response.headers["etag"]
+    assert "last-modified" not in response.headers
+    
+    response = client.get("/api/v1/notes/", headers={**admin_header, "If-None-Match": etag})
+    assert response.status_code == 304
+    
+    client.delete(f"/api/v1/notes/{newest.id}", headers=get_auth_header(client))
+    response = client.get("/api/v1/notes/", headers={**admin_header, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()["items"]] == ["Older"]
+    
+    response = client.get(
+        "/api/v1/notes/",
+        headers={**admin_header, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    )
+    assert response.status_code == 200
+
+
+def test_fast_serialization_matches_response_model(client: TestClient, db: Session):
+    """
+    Test that the column-row serializers produce the response_model's JSON
+    """
+    user = create_test_user(db)
+    note = create_test_note(db, user.id, "Café", None)
+    auth_header = get_auth_header(client)
+    expected = NoteResponse.model_validate(note).model_dump(mode="json")
+    
+    response = client.get(f"/api/v1/notes/{note.id}", headers=auth_header)
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == expected
+    
+    response = client.get("/api/v1/notes/", headers=auth_header)
+    assert response.json()["items"] == [expected]
+    assert response.json()["meta"]["total"] == 1
+    
+    response = client.get("/api/v1/notes/search?q=café", headers=auth_header)
+    assert response.json()["items"] == [expected]
+
+
+def test_get_notes_sparse_fields(client: TestClient, db: Session):
+    """
+    Test that `fields` trims list items and still paginates by cursor
+    """
+    user = create_test_user(db)
+    for i in range(3):
+        create_test_note(db, user.id, f"Note {i}", "x" * 1000)
+    auth_header = get_auth_header(client)
+    
+    response = client.get("/api/v1/notes/?fields=title,id&size=2", headers=auth_header)
+    assert response.status_code == 200
+    data = response.json()
+    assert [set(item) for item in data["items"]] == [{"id", "title"}] * 2
+    
+    response = client.get(
+        f"/api/v1/notes/?fields=title&size=2&cursor={data['meta']['next_cursor']}", headers=auth_header
+    )
+    assert response.json()["items"] == [{"title": "Note 0"}]
+    
+    response = client.get("/api/v1/notes/?fields=title,secret", headers=auth_header)
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
+
+
+def test_sparse_fields_documented(client: TestClient):
+    """
+    Test that the listing schema admits items trimmed by `fields`
+    """
+    schema = client.get("/openapi.json").json()
+    for path in ("/api/v1/notes/", "/api/v1/notes/by-user/{user_id}"):
+        page_ref = schema["paths"][path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]["$ref"]
+        page = schema["components"]["schemas"][page_ref.rsplit("/", 1)[-1]]
+        item_refs = [option["$ref"] for option in page["properties"]["items"]["items"]["anyOf"]]
+        assert item_refs == ["#/components/schemas/NoteResponse", "#/components/schemas/NoteSparseResponse"]
+    assert "required" not in schema["components"]["schemas"]["NoteSparseResponse"]
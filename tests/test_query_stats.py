@@ -0,0 +1,103 @@
+import logging
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.middleware import QueryStatsMiddleware
+from app.db.query_stats import (
+    QueryStats,
+    QueryStatsFilter,
+    RepeatedQueryError,
+    allow_repeated_queries,
+    current_query_stats,
+)
+from tests.utils import create_test_user, create_test_note, get_auth_header
+
+SERVER_TIMING = re.compile(r'db;dur=(\d+\.\d);desc="(\d+) queries"')
+
+
+def repeating_app(times: int, allow_repeats: bool = False) -> FastAPI:
+    """App whose one endpoint runs the same statement `times` times"""
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/repeat")
+    def repeat():
+        if allow_repeats:
+            allow_repeated_queries()
+        with engine.connect() as conn:
+            for i in range(times):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {"ok": True}
+
+    return app
+
+
+def test_server_timing_header(client: TestClient, db: Session):
+    """Responses report the request's query count and DB time"""
+    user = create_test_user(db, email="test@example.com", password="password123")
+    note = create_test_note(db, user.id)
+    headers = get_auth_header(client)
+
+    response = client.get(f"/api/v1/notes/{note.id}", headers=headers)
+    assert response.status_code == 200
+    match = SERVER_TIMING.fullmatch(response.headers["Server-Timing"])
+    assert match is not None
+    assert int(match.group(2)) >= 1
+
+    response = client.get("/health")
+    assert response.headers["Server-Timing"] == 'db;dur=0.0;desc="0 queries"'
+
+
+def test_repeated_statement_fails_in_test_mode(monkeypatch):
+    """Running one statement shape past the threshold fails the request"""
+    monkeypatch.setattr(settings, "QUERY_REPEAT_THRESHOLD", 3)
+    monkeypatch.setattr(settings, "QUERY_REPEAT_FAIL", True)
+    with TestClient(repeating_app(3)) as c:
+        response = c.get("/repeat")
+        assert SERVER_TIMING.fullmatch(response.headers["Server-Timing"]).group(2) == "3"
+    with TestClient(repeating_app(4)) as c, pytest.raises(RepeatedQueryError):
+        c.get("/repeat")
+
+
+def test_repeated_statement_opt_out(monkeypatch):
+    """Endpoints that repeat statements by design can opt out of the check"""
+    monkeypatch.setattr(settings, "QUERY_REPEAT_THRESHOLD", 3)
+    monkeypatch.setattr(settings, "QUERY_REPEAT_FAIL", True)
+    with TestClient(repeating_app(5, allow_repeats=True)) as c:
+        response = c.get("/repeat")
+    assert response.status_code == 200
+    assert SERVER_TIMING.fullmatch(response.headers["Server-Timing"]).group(2) == "5"
+
+
+def test_repeated_statement_warns(monkeypatch, caplog):
+    """Outside test mode the repeat is only logged"""
+    monkeypatch.setattr(settings, "QUERY_REPEAT_THRESHOLD", 3)
+    monkeypatch.setattr(settings, "QUERY_REPEAT_FAIL", False)
+    with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+        with TestClient(repeating_app(5)) as c:
+            response = c.get("/repeat")
+    assert response.status_code == 200
+    assert SERVER_TIMING.fullmatch(response.headers["Server-Timing"]).group(2) == "5"
+    warnings = [r for r in caplog.records if "possible N+1" in r.getMessage()]
+    assert len(warnings) == 1
+
+
+def test_access_log_filter():
+    """Access log records get the current request's stats appended"""
+    record = logging.LogRecord("uvicorn.access", logging.INFO, "", 0, '"%s %s" %d', ("GET", "/", 200), None)
+    stats = QueryStats()
+    stats.record("SELECT 1", 0.0025)
+    token = current_query_stats.set(stats)
+    try:
+        QueryStatsFilter().filter(record)
+    finally:
+        current_query_stats.reset(token)
+    assert record.db_timing == "1 queries 2.5ms"
+    assert record.getMessage() == '"GET /" 200 - 1 queries 2.5ms'
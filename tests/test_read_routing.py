@@ -0,0 +1,73 @@
+import time
+
+from fastapi import Request
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import read_from_writer
+from tests.utils import create_test_user
+
+
+def make_request(method: str = "GET", headers: dict = None) -> Request:
+    """Build a bare request for exercising the routing decision"""
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": method, "headers": raw_headers})
+
+
+def test_safe_request_uses_reader():
+    """
+    Test that plain reads go to the reader
+    """
+    assert read_from_writer(make_request()) is False
+
+
+def test_unsafe_request_uses_writer():
+    """
+    Test that writes always go to the writer
+    """
+    assert read_from_writer(make_request("POST")) is True
+
+
+def test_recent_write_sticks_to_writer():
+    """
+    Test that a recent write marker (header or cookie) routes reads to the writer
+    """
+    now = f"{time.time():.3f}"
+    assert read_from_writer(make_request(headers={settings.READ_YOUR_WRITES_HEADER: now})) is True
+    assert read_from_writer(
+        make_request(headers={"Cookie": f"{settings.READ_YOUR_WRITES_COOKIE}={now}"})
+    ) is True
+
+
+def test_expired_write_marker_uses_reader():
+    """
+    Test that an old or malformed write marker is ignored
+    """
+    old = f"{time.time() - settings.READ_YOUR_WRITES_SECONDS - 1:.3f}"
+    assert read_from_writer(make_request(headers={settings.READ_YOUR_WRITES_HEADER: old})) is False
+    assert read_from_writer(make_request(headers={settings.READ_YOUR_WRITES_HEADER: "junk"})) is False
+
+
+def test_write_response_sets_marker(client: TestClient, db: Session):
+    """
+    Test that successful writes hand the client a write marker
+    """
+    create_test_user(db)
+    login_response = client.post(
+        "/api/v1/auth/login", data={"username": "test@example.com", "password": "password123"}
+    )
+    token = login_response.json()["access_token"]
+    
+    response = client.post(
+        "/api/v1/notes/",
+        json={"title": "Test Note"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 201
+    assert settings.READ_YOUR_WRITES_HEADER in response.headers
+    assert settings.READ_YOUR_WRITES_COOKIE in response.cookies
+    
+    # Reads never hand out a marker
+    response = client.get("/api/v1/notes/", headers={"Authorization": f"Bearer {token}"})
+    assert settings.READ_YOUR_WRITES_HEADER not in response.headers
@@ -0,0 +1,168 @@
+import asyncio
+import fnmatch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.utils.response_cache import CacheBackend, MemoryCacheBackend, RedisCacheBackend, ResponseCache, note_list_cache
+from tests.utils import create_test_user, create_test_note
+
+
+class FakeRedis:
+    """Just enough of the redis.asyncio client for the cache backend"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+
+    async def scan_iter(self, match=None, count=None):
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+def exercise_backend(backend):
+    """Run the scope and invalidation rules against `backend`"""
+    async def run():
+        cache = ResponseCache(backend, ttl=60)
+        await cache.set(1, "page", b"owner 1")
+        await cache.set(2, "page", b"owner 2")
+        await cache.set(None, "page", b"all")
+        assert await cache.get(1, "page") == b"owner 1"
+        assert await cache.get(None, "page") == b"all"
+        
+        # A write by owner 1 drops its entries and the admin scope, not owner 2's
+        await cache.invalidate([1])
+        assert await cache.get(1, "page") is None
+        assert await cache.get(None, "page") is None
+        assert await cache.get(2, "page") == b"owner 2"
+    
+    asyncio.run(run())
+
+
+def test_memory_backend():
+    """
+    Test per-owner invalidation with the in-process backend
+    """
+    exercise_backend(MemoryCacheBackend(maxsize=10, ttl=60))
+
+
+def test_memory_backend_is_bounded():
+    """
+    Test that the in-process backend evicts the least recently used entry
+    """
+    async def run():
+        cache = ResponseCache(MemoryCacheBackend(maxsize=2, ttl=60), ttl=60)
+        for key in ("a", "b", "c"):
+            await cache.set(1, key, key.encode())
+        assert await cache.get(1, "a") is None
+        assert await cache.get(1, "c") == b"c"
+    
+    asyncio.run(run())
+
+
+def test_memory_backend_counters_are_bounded():
+    """
+    Test that generation counters are evicted like entries, without reviving
+    entries their owner invalidated
+    """
+    async def run():
+        backend = MemoryCacheBackend(maxsize=2, ttl=60)
+        cache = ResponseCache(backend, ttl=60)
+        await cache.invalidate([1])
+        await cache.set(1, "page", b"owner 1")
+        await cache.invalidate([1])
+        for owner_id in range(2, 6):
+            await cache.invalidate([owner_id])
+        assert len(backend.counters) == 2
+        assert "gen:owner:1" not in backend.counters
+        assert await cache.get(1, "page") is None
+    
+    asyncio.run(run())
+
+
+def test_incomplete_backend_rejected():
+    """
+    Test that a backend missing methods fails when created, not on first use
+    """
+    class GetOnly(CacheBackend):
+        async def get(self, key):
+            return None
+    
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_redis_backend():
+    """
+    Test per-owner invalidation with the shared-store adapter
+    """
+    exercise_backend(RedisCacheBackend(FakeRedis()))
+
+
+def test_redis_backend_clear():
+    """
+    Test that clearing the shared-store adapter only drops keys under its prefix
+    """
+    async def run():
+        client = FakeRedis()
+        client.data["other-app:key"] = b"kept"
+        backend = RedisCacheBackend(client)
+        backend.SCAN_BATCH = 2
+        cache = ResponseCache(backend, ttl=60)
+        for owner_id in range(1, 6):
+            await cache.set(owner_id, "page", b"body")
+        await cache.invalidate([1])
+        
+        await cache.clear()
+        assert client.data == {"other-app:key": b"kept"}
+        assert await cache.get(2, "page") is None
+    
+    asyncio.run(run())
+
+
+def test_disabled_cache():
+    """
+    Test that a zero TTL disables caching
+    """
+    async def run():
+        cache = ResponseCache(MemoryCacheBackend(maxsize=10, ttl=60), ttl=0)
+        await cache.set(1, "page", b"body")
+        assert await cache.get(1, "page") is None
+    
+    asyncio.run(run())
+
+
+def test_note_list_served_from_cache(client: TestClient, db: Session):
+    """
+    Test that list pages are cached and refreshed after a write
+    """
+    user = create_test_user(db)
+    create_test_note(db, user.id, "First")
+    login_response = client.post(
+        "/api/v1/auth/login", data={"username": "test@example.com", "password": "password123"}
+    )
+    auth_header = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    
+    response = client.get("/api/v1/notes/", headers=auth_header)
+    etag = response.headers["etag"]
+    assert asyncio.run(note_list_cache.get(user.id, etag)) == response.content
+    
+    response = client.post("/api/v1/notes/", json={"title": "Second"}, headers=auth_header)
+    assert asyncio.run(note_list_cache.get(user.id, etag)) is None
+    
+    response = client.get("/api/v1/notes/", headers=auth_header)
+    assert [item["title"] for item in response.json()["items"]] == ["Second", "First"]
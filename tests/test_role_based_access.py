@@ -4,18 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.models.user import User, UserRole
 from app.models.note import Note
-from tests.utils import create_test_user, create_test_note
-
-
-def get_auth_header(client, user_email="test@example.com", user_password="password123"):
-    """Helper function to get authentication headers"""
-    login_data = {
-        "username": user_email,  # OAuth2 form expects 'username', not 'email'
-        "password": user_password
-    }
-    login_response = client.post("/api/v1/auth/login", data=login_data)
-    token = login_response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+from tests.utils import create_test_user, create_test_note, get_auth_header
 
 
 def test_admin_access_to_all_notes(client: TestClient, db: Session):
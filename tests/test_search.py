@@ -0,0 +1,103 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.user import UserRole
+from app.utils.search import check_search_support
+from tests.utils import create_test_user, create_test_note, get_auth_header
+
+
+def test_search_notes(client: TestClient, db: Session):
+    """
+    Test ranked search over titles and descriptions
+    """
+    user = create_test_user(db)
+    auth_header = get_auth_header(client)
+    create_test_note(db, user.id, "Grocery list", "Milk, eggs and bread")
+    create_test_note(db, user.id, "Meeting", "Discuss the bread supplier contract")
+    create_test_note(db, user.id, "Holiday", "Book flights")
+    
+    response = client.get("/api/v1/notes/search?q=bread", headers=auth_header)
+    assert response.status_code == 200
+    titles = [note["title"] for note in response.json()["items"]]
+    assert sorted(titles) == ["Grocery list", "Meeting"]
+    
+    # All terms must match
+    response = client.get("/api/v1/notes/search?q=bread contract", headers=auth_header)
+    assert [note["title"] for note in response.json()["items"]] == ["Meeting"]
+    
+    # Title matches rank first
+    create_test_note(db, user.id, "Flights", "Compare prices")
+    response = client.get("/api/v1/notes/search?q=flights", headers=auth_header)
+    assert [note["title"] for note in response.json()["items"]] == ["Flights", "Holiday"]
+
+
+def test_search_follows_writes(client: TestClient, db: Session):
+    """
+    Test that the search index follows updates and deletes made through the API
+    """
+    user = create_test_user(db)
+    auth_header = get_auth_header(client)
+    note = create_test_note(db, user.id, "Draft", "alpha")
+    
+    client.put(f"/api/v1/notes/{note.id}", json={"description": "omega"}, headers=auth_header)
+    response = client.get("/api/v1/notes/search?q=alpha", headers=auth_header)
+    assert response.json()["items"] == []
+    response = client.get("/api/v1/notes/search?q=omega", headers=auth_header)
+    assert len(response.json()["items"]) == 1
+    
+    client.delete(f"/api/v1/notes/{note.id}", headers=auth_header)
+    response = client.get("/api/v1/notes/search?q=omega", headers=auth_header)
+    assert response.json()["items"] == []
+
+
+def test_search_scoped_to_owner(client: TestClient, db: Session):
+    """
+    Test that users only find their own notes while admins find all
+    """
+    user = create_test_user(db)
+    other = create_test_user(db, email="other@example.com")
+    create_test_user(db, email="admin@example.com", role=UserRole.ADMIN)
+    create_test_note(db, user.id, "Mine", "shared keyword")
+    create_test_note(db, other.id, "Theirs", "shared keyword")
+    
+    response = client.get("/api/v1/notes/search?q=keyword", headers=get_auth_header(client))
+    assert [note["title"] for note in response.json()["items"]] == ["Mine"]
+    
+    response = client.get(
+        "/api/v1/notes/search?q=keyword", headers=get_auth_header(client, "admin@example.com")
+    )
+    assert len(response.json()["items"]) == 2
+
+
+def test_search_pagination_and_operators(client: TestClient, db: Session):
+    """
+    Test paging through results and that query syntax is treated as text
+    """
+    user = create_test_user(db)
+    auth_header = get_auth_header(client)
+    for i in range(3):
+        create_test_note(db, user.id, f"Report {i}")
+    
+    response = client.get("/api/v1/notes/search?q=report&size=2", headers=auth_header)
+    data = response.json()
+    assert len(data["items"]) == 2
+    assert data["meta"]["has_more"] is True
+    
+    response = client.get("/api/v1/notes/search?q=report&size=2&page=2", headers=auth_header)
+    data = response.json()
+    assert len(data["items"]) == 1
+    assert data["meta"]["has_more"] is False
+    
+    response = client.get('/api/v1/notes/search?q=report" OR "x*', headers=auth_header)
+    assert response.status_code == 200
+
+
+def test_search_dialect_checked_at_startup():
+    """
+    Test that an unsupported database is a configuration error, not a 500 per search
+    """
+    check_search_support("postgresql")
+    check_search_support("sqlite")
+    with pytest.raises(RuntimeError, match="mysql"):
+        check_search_support("mysql")
@@ -0,0 +1,40 @@
+from app.core.config import settings
+from app.core.server import available_cpus, cgroup_cpu_quota, gunicorn_options, worker_count
+
+
+def test_cgroup_v2_quota(tmp_path):
+    """cpu.max gives quota and period; "max" means unlimited"""
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) == 1.5
+    assert available_cpus(str(tmp_path)) <= 2
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+
+
+def test_cgroup_v1_quota(tmp_path):
+    """The CFS quota files are used without cpu.max; -1 means unlimited"""
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) == 1
+    assert available_cpus(str(tmp_path)) == 1
+
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+
+
+def test_no_cgroup(tmp_path):
+    """Without cgroup files the affinity mask decides, never below one worker"""
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+    assert available_cpus(str(tmp_path)) >= 1
+
+
+def test_worker_count_override(monkeypatch):
+    """WEB_CONCURRENCY wins over auto-sizing"""
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 3)
+    assert worker_count() == 3
+    options = gunicorn_options()
+    assert options["workers"] == 3
+    assert options["preload_app"] is True
+    assert options["worker_class"] == "uvicorn.workers.UvicornWorker"
@@ -3,6 +3,7 @@ from typing import Dict, Optional
 from app.models.user import User, UserRole
 from app.models.note import Note
 from app.utils.auth import get_password_hash
+from app.utils.note_stats import description_bytes
 
 
 def create_test_user(
@@ -42,6 +43,27 @@ def create_test_note(
         owner_id=user_id
     )
     db.add(note)
+    
+    # Keep the owner's counters in step, as the API write paths do
+    db.query(User).filter(User.id == user_id).update(
+        {
+            User.note_count: User.note_count + 1,
+            User.note_bytes: User.note_bytes + description_bytes(description),
+            User.updated_at: User.updated_at,
+        },
+        synchronize_session=False
+    )
     db.commit()
     db.refresh(note)
-    return note
\ No newline at end of file
+    return note
+
+
+def get_auth_header(client, user_email: str = "test@example.com", user_password: str = "password123") -> Dict[str, str]:
+    """
+    Log in through the API and return the Authorization header for the user
+    """
+    login_response = client.post(
+        "/api/v1/auth/login",
+        data={"username": user_email, "password": user_password}  # OAuth2 form expects 'username'
+    )
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}